@@ -0,0 +1,75 @@
+# Benchmark of the ask/tell interface of the swarm.
+#
+# A batch queue, standing in for a cluster scheduler, evaluates batches of positions on a background thread with a
+# fixed latency per batch. The swarm is driven through ask() and tell(): every batch asked is split into jobs that fit
+# the queue, and while they run the caller is free to do its own work (here, writing the previous results to a log).
+# The run must end on exactly the same gbest as optimize() on the same seed, and the time of both is reported.
+#
+# usage: python ask-tell.py [population_size] [iterations] [job size] [milliseconds of latency per job]
+
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from numpy import array_equal, concatenate
+
+from functions import Rastrigin
+from swarm import Swarm
+
+
+class BatchQueue:
+    """
+    Queue of evaluation jobs, run one after the other by a worker thread, each taking at least latency seconds.
+    """
+
+    def __init__(self, objective, latency):
+        self.objective = objective
+        self.latency = latency
+        self.jobs = queue.Queue()
+        threading.Thread(target=self.work, daemon=True).start()
+
+    def work(self):
+        while True:
+            positions, done = self.jobs.get()
+            time.sleep(self.latency)
+            done.put(self.objective(positions))
+
+    def submit(self, positions):
+        done = queue.Queue(maxsize=1)
+        self.jobs.put((positions.copy(), done))
+        return done
+
+
+if __name__ == "__main__":
+    population_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    jobSize = int(sys.argv[3]) if len(sys.argv) > 3 else 25
+    latency = float(sys.argv[4]) if len(sys.argv) > 4 else 1.0
+    objective = Rastrigin()
+    parameters = (population_size, 10, iterations, objective.bounds, 0.7, 1.5, 1.5, "min")
+
+    swarm = Swarm(*parameters, objective=objective, stopping=[], seed=0)
+    start = time.perf_counter()
+    swarm.optimize()
+    optimizeTime, optimizeGbest = time.perf_counter() - start, swarm.gbest
+
+    batches = BatchQueue(objective, latency / 1000.0)
+    swarm = Swarm(*parameters, stopping=[], seed=0)
+    log = []
+    start = time.perf_counter()
+    stop = False
+    while not stop and swarm.iteration < swarm.maxiterations:
+        positions = swarm.ask()
+        jobs = [batches.submit(positions[first:first + jobSize]) for first in range(0, population_size, jobSize)]
+        log.append("%d %.6g" % (swarm.iteration, swarm.gbestFitness))  # own work, overlapped with the evaluations
+        stop = swarm.tell(positions, concatenate([job.get() for job in jobs]))
+    askTellTime = time.perf_counter() - start
+
+    print("optimize()  : %8.3f s" % optimizeTime)
+    print("ask/tell    : %8.3f s   (%d jobs of %d positions per iteration, %.1f ms latency per job)" % (
+        askTellTime, -(-population_size // jobSize), jobSize, latency))
+    print("identical gbest: %s" % array_equal(swarm.gbest, optimizeGbest))
@@ -0,0 +1,51 @@
+# Benchmark of the asynchronous (steady-state) mode of the swarm against the synchronous one.
+#
+# The objective is the sphere function with an evaluation time that varies 10x across the search space, from 1 ms at
+# the origin to 10 ms at the corners of the box, like a simulation whose cost depends on its parameters. It sleeps
+# rather than computes so that the thread backend can overlap evaluations on any machine. Both modes get the same
+# evaluation budget and the same number of workers; evaluations per second and the final gbest fitness are reported.
+#
+# usage: python asynchronous-mode.py [population_size] [iterations] [workers]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from numpy import asarray
+
+from swarm import *
+
+BOUNDS = [-5, 5]
+
+
+def slowSphere(positions):
+    """
+    Sphere function that takes 1 ms to 10 ms per position, depending on how far the position is from the origin.
+    """
+    positions = asarray(positions)
+    fraction = abs(positions).max(axis=1).sum() / (BOUNDS[1] * len(positions))
+    time.sleep(len(positions) * (0.001 + 0.009 * fraction))
+    return (positions * positions).sum(axis=1)
+
+
+def run(population_size, iterations, workers, asynchronous):
+    with Swarm(population_size, 4, iterations, BOUNDS, 0.7, 1.5, 1.5, "min", objective=slowSphere, workers=workers,
+               backend="thread", seed=0) as swarm:
+        swarm.evaluator.chunksize = 1  # one position per task in both modes, so only the scheduling differs
+        swarm.optimizeAsync() if asynchronous else swarm.optimize()
+        return swarm.evaluationsPerSecond, swarm.evaluations, swarm.gbestFitness
+
+
+if __name__ == "__main__":
+    population_size = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    results = [(name, run(population_size, iterations, workers, asynchronous))
+               for name, asynchronous in (("synchronous", False), ("asynchronous", True))]
+
+    for name, (throughput, evaluations, fitness) in results:
+        print("%-13s: %8.1f evaluations/s   %6d evaluations   best fitness %.6g" % (
+            name, throughput, evaluations, fitness))
@@ -0,0 +1,142 @@
+# Benchmark suite of the swarm on the standard test functions of functions.py.
+#
+# Every combination of function, dimension and population size is optimized for a fixed number of iterations with
+# each seed. For every run the wall time, the evaluations per second, the peak memory allocated during the run and the
+# final error, i.e. the distance of the gbest fitness from the known optimum, are recorded and written as JSON.
+#
+# Given a baseline file (a results file of an earlier run, by default the stored baseline.json), the runs are compared
+# with the matching baseline runs, and the script exits with a non-zero status when any configuration got slower, or
+# any run got a worse final error, by more than the tolerances. Throughputs depend on the machine: regenerate the
+# baseline with --output baseline.json --baseline '' when benchmarking on a different one.
+#
+# usage: python benchmark-suite.py [--functions sphere rosenbrock ...] [--dimensions 10 30] [--populations 50]
+#                                  [--iterations 2000] [--seeds 0 1 2] [--output results.json]
+#                                  [--baseline baseline.json] [--slowdown 0.3] [--error-factor 10]
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy
+from numpy import median
+
+from functions import FUNCTIONS
+from swarm import Swarm
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+MEMORY_ITERATIONS = 20  # the peak memory is reached in the first iterations, the memory run is kept short
+
+
+def runOnce(function, dimension, population, iterations, seed):
+    swarm = Swarm(population, dimension, iterations, function.bounds, 0.7298, 1.49618, 1.49618, "min",
+                  objective=function, stopping=[], seed=seed)
+    start = time.perf_counter()
+    swarm.optimize()
+    wallTime = time.perf_counter() - start
+
+    # memory is measured in a separate, short run, since tracing allocations slows the timed one down
+    tracemalloc.start()
+    Swarm(population, dimension, min(iterations, MEMORY_ITERATIONS), function.bounds, 0.7298, 1.49618, 1.49618,
+          "min", objective=function, stopping=[], seed=seed).optimize()
+    peakMemory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "function": function.name,
+        "dimension": dimension,
+        "population": population,
+        "iterations": iterations,
+        "seed": seed,
+        "wallTime": wallTime,
+        "evaluationsPerSecond": swarm.evaluationsPerSecond,
+        "peakMemory": peakMemory,
+        "finalError": abs(swarm.gbestFitness - function.optimumFitness),
+    }
+
+
+def key(result):
+    return result["function"], result["dimension"], result["population"], result["iterations"], result["seed"]
+
+
+def medianThroughput(results):
+    """
+    Function to get the median evaluations per second of every configuration over its seeds, which is much less noisy
+    than the throughput of single runs.
+
+    :return: dict from (function, dimension, population, iterations) to evaluations per second
+    """
+    throughputs = {}
+    for result in results:
+        throughputs.setdefault(key(result)[:-1], []).append(result["evaluationsPerSecond"])
+    return {configuration: float(median(values)) for configuration, values in throughputs.items()}
+
+
+def compare(results, baseline, slowdown, errorFactor):
+    """
+    Function to compare the results with a baseline.
+
+    A configuration regresses if its median throughput dropped by more than the slowdown fraction, and a run regresses
+    if its final error grew by more than errorFactor times (errors below 1e-8 are all considered equal, they are at the
+    precision of the functions).
+
+    :return: list of messages describing the regressions
+    """
+    regressions = []
+    baselineThroughput = medianThroughput(baseline["results"])
+    for configuration, throughput in medianThroughput(results).items():
+        reference = baselineThroughput.get(configuration)
+        if reference is not None and throughput < reference * (1 - slowdown):
+            regressions.append("%s: %.0f evaluations/s, baseline %.0f" % (configuration, throughput, reference))
+
+    baselineRuns = {key(result): result for result in baseline["results"]}
+    for result in results:
+        reference = baselineRuns.get(key(result))
+        if reference is not None and result["finalError"] > max(reference["finalError"], 1e-8) * errorFactor:
+            regressions.append("%s: final error %.3e, baseline %.3e" % (
+                key(result), result["finalError"], reference["finalError"]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the swarm on standard test functions.")
+    parser.add_argument("--functions", nargs="+", default=sorted(FUNCTIONS), choices=sorted(FUNCTIONS))
+    parser.add_argument("--dimensions", nargs="+", type=int, default=[10, 30])
+    parser.add_argument("--populations", nargs="+", type=int, default=[50])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--output", default="results.json", help="file the results are written to")
+    parser.add_argument("--baseline", default=BASELINE, help="results file to compare against, '' to skip")
+    parser.add_argument("--slowdown", type=float, default=0.3, help="largest accepted drop in evaluations/s")
+    parser.add_argument("--error-factor", type=float, default=10.0, help="largest accepted growth of final error")
+    arguments = parser.parse_args()
+
+    results = []
+    for name in arguments.functions:
+        for dimension in arguments.dimensions:
+            for population in arguments.populations:
+                for seed in arguments.seeds:
+                    result = runOnce(FUNCTIONS[name], dimension, population, arguments.iterations, seed)
+                    results.append(result)
+                    print("%-10s  dimension %4d  population %5d  seed %3d  %8.3f s  %10.0f evaluations/s  "
+                          "peak %8.1f kB  error %.3e" % (
+                              name, dimension, population, seed, result["wallTime"], result["evaluationsPerSecond"],
+                              result["peakMemory"] / 1024, result["finalError"]))
+
+    with open(arguments.output, "w") as output:
+        json.dump({"python": platform.python_version(), "numpy": numpy.__version__, "machine": platform.machine(),
+                   "results": results}, output, indent=1)
+
+    if arguments.baseline and os.path.exists(arguments.baseline):
+        with open(arguments.baseline) as baselineFile:
+            regressions = compare(results, json.load(baselineFile), arguments.slowdown, arguments.error_factor)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            sys.exit(1)
+        print("no regression against", arguments.baseline)
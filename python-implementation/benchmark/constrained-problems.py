@@ -0,0 +1,67 @@
+# Benchmark of the constraint handling of the swarm.
+#
+# Every method of Constraints (Deb's feasibility rules, static penalty, adaptive penalty) is run on the same seeds
+# against a few classic constrained problems, with and without skipping the objective for the positions that violate
+# the cheap constraints. The median error to the known optimum, the number of runs ending on a feasible gbest, and the
+# objective calls actually made and skipped are reported. The optima of g06 and pressure-vessel lie at their bounds,
+# so the swarm absorbs the particles at the bounds rather than redrawing them at random, which would keep them from
+# settling there.
+#
+# usage: python constrained-problems.py [iterations] [seeds]
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from numpy import median
+
+from constraints import Constraint, Constraints
+from functions import CountedObjective
+from swarm import Swarm
+
+
+# name: (objective, constraints, bounds, optimum fitness)
+PROBLEMS = {
+    # Bracken and McCormick: an equality and an inequality constraint
+    "bracken": (lambda x: (x[:, 0] - 2) ** 2 + (x[:, 1] - 1) ** 2,
+                [Constraint(lambda x: x[:, 0] - 2 * x[:, 1] + 1, "equality", tolerance=1e-4),
+                 Constraint(lambda x: x[:, 0] ** 2 / 4 + x[:, 1] ** 2 - 1, cheap=True)],
+                [[-3, -3], [3, 3]], 1.3933),
+    # g06 of the CEC 2006 suite: a narrow crescent-shaped feasible region
+    "g06": (lambda x: (x[:, 0] - 10) ** 3 + (x[:, 1] - 20) ** 3,
+            [Constraint(lambda x: 100 - (x[:, 0] - 5) ** 2 - (x[:, 1] - 5) ** 2, cheap=True),
+             Constraint(lambda x: (x[:, 0] - 6) ** 2 + (x[:, 1] - 5) ** 2 - 82.81, cheap=True)],
+            [[13, 0], [100, 100]], -6961.81388),
+    # pressure vessel design, with the thicknesses as continuous variables
+    "pressure-vessel": (lambda x: 0.6224 * x[:, 0] * x[:, 2] * x[:, 3] + 1.7781 * x[:, 1] * x[:, 2] ** 2 +
+                        3.1661 * x[:, 0] ** 2 * x[:, 3] + 19.84 * x[:, 0] ** 2 * x[:, 2],
+                        [Constraint(lambda x: -x[:, 0] + 0.0193 * x[:, 2], cheap=True),
+                         Constraint(lambda x: -x[:, 1] + 0.00954 * x[:, 2], cheap=True),
+                         Constraint(lambda x: 1296000 - 3.14159265 * x[:, 2] ** 2 * x[:, 3] -
+                                    4 / 3 * 3.14159265 * x[:, 2] ** 3)],
+                        [[0, 0, 10, 10], [99, 99, 200, 200]], 5885.3328),
+}
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    seeds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    for name, (function, constraints, bounds, optimum) in PROBLEMS.items():
+        print("%s, optimum %g, %d iterations, %d seeds" % (name, optimum, iterations, seeds))
+        for method in ("feasibility", "penalty", "adaptive"):
+            for skip in (False, True):
+                errors, feasible, calls, skipped = [], 0, 0, 0
+                for seed in range(seeds):
+                    objective = CountedObjective(function)
+                    swarm = Swarm(40, len(bounds[0]), iterations, bounds, 0.7, 1.5, 1.5, "min", objective=objective,
+                                  stopping=[], seed=seed, boundary="absorb",
+                                  constraints=Constraints(constraints, method=method, penalty=1e4, skip=skip))
+                    swarm.optimize()
+                    errors.append(swarm.gbestFitness - optimum)
+                    feasible += swarm.gbestViolation == 0
+                    calls += objective.calls
+                    skipped += swarm.skippedEvaluations
+                print("%-12s skip=%-5s: median error %12.6g   feasible %2d/%d   %9d objective calls   %9d skipped" % (
+                    method, skip, median(errors), feasible, seeds, calls, skipped))
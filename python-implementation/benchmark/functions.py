@@ -0,0 +1,142 @@
+import time
+
+from numpy import abs, arange, cos, e, exp, full, ones, pi, sin, sqrt, zeros
+
+
+class BenchmarkFunction:
+    """
+    This class is the base of the standard test functions used to benchmark the swarm.
+
+    Every function is a batched objective: called with an (n, dimension) array of positions it returns the n fitness
+    values, computed with array operations over the whole batch. All of them are to be minimized, and know their
+    conventional search domain and their global optimum, so the error of a run can be measured.
+
+    """
+
+    name = None
+    bounds = None  # [lower-bound, upper-bound] shared by every variable
+    optimumFitness = 0.0  # fitness at the global optimum
+
+    def optimum(self, dimension):
+        """
+        Function to get the position of the global optimum.
+
+        :param dimension: number of variables
+        :return: (dimension,) array
+        """
+        return zeros(dimension)
+
+    def __call__(self, positions):
+        raise NotImplementedError
+
+
+class Sphere(BenchmarkFunction):
+    """
+    f(x) = sum(xi^2), unimodal, optimum f(0, ..., 0) = 0
+    """
+
+    name = "sphere"
+    bounds = [-5.12, 5.12]
+
+    def __call__(self, positions):
+        return (positions * positions).sum(axis=1)
+
+
+class Rosenbrock(BenchmarkFunction):
+    """
+    f(x) = sum(100 (x(i+1) - xi^2)^2 + (1 - xi)^2) for i = 1 .. n-1, a narrow curved valley, optimum f(1, ..., 1) = 0
+    """
+
+    name = "rosenbrock"
+    bounds = [-5.0, 10.0]
+
+    def optimum(self, dimension):
+        return ones(dimension)
+
+    def __call__(self, positions):
+        x, following = positions[:, :-1], positions[:, 1:]
+        return (100 * (following - x * x) ** 2 + (1 - x) ** 2).sum(axis=1)
+
+
+class Rastrigin(BenchmarkFunction):
+    """
+    f(x) = 10 n + sum(xi^2 - 10 cos(2 pi xi)), highly multimodal, optimum f(0, ..., 0) = 0
+    """
+
+    name = "rastrigin"
+    bounds = [-5.12, 5.12]
+
+    def __call__(self, positions):
+        return 10 * positions.shape[1] + (positions * positions - 10 * cos(2 * pi * positions)).sum(axis=1)
+
+
+class Ackley(BenchmarkFunction):
+    """
+    f(x) = -20 exp(-0.2 sqrt(mean(xi^2))) - exp(mean(cos(2 pi xi))) + 20 + e, optimum f(0, ..., 0) = 0
+    """
+
+    name = "ackley"
+    bounds = [-32.768, 32.768]
+
+    def __call__(self, positions):
+        return (-20 * exp(-0.2 * sqrt((positions * positions).mean(axis=1)))
+                - exp(cos(2 * pi * positions).mean(axis=1)) + 20 + e)
+
+
+class Griewank(BenchmarkFunction):
+    """
+    f(x) = 1 + sum(xi^2) / 4000 - prod(cos(xi / sqrt(i))), optimum f(0, ..., 0) = 0
+    """
+
+    name = "griewank"
+    bounds = [-600.0, 600.0]
+
+    def __call__(self, positions):
+        return 1 + (positions * positions).sum(axis=1) / 4000 - cos(
+            positions / sqrt(arange(1, positions.shape[1] + 1))).prod(axis=1)
+
+
+class Schwefel(BenchmarkFunction):
+    """
+    f(x) = 418.9829 n - sum(xi sin(sqrt(|xi|))), deceptive, the optimum f(420.9687, ..., 420.9687) ~ 0 lies far from
+    the second best minima
+    """
+
+    name = "schwefel"
+    bounds = [-500.0, 500.0]
+
+    def optimum(self, dimension):
+        return full(dimension, 420.968746)
+
+    def __call__(self, positions):
+        return 418.9828872724339 * positions.shape[1] - (positions * sin(sqrt(abs(positions)))).sum(axis=1)
+
+
+# the benchmark functions selectable by name
+FUNCTIONS = {function.name: function for function in
+             (Sphere(), Rosenbrock(), Rastrigin(), Ackley(), Griewank(), Schwefel())}
+
+
+def expensiveSphere(position, milliseconds):
+    """
+    Sphere function of a single position that keeps the CPU busy for the given number of milliseconds before
+    returning, to stand for an expensive objective, e.g. wrapped in a ScalarObjective.
+    """
+    deadline = time.process_time() + milliseconds / 1000.0
+    while time.process_time() < deadline:
+        pass
+    return float((position * position).sum())
+
+
+class CountedObjective:
+    """
+    Batched objective that counts the positions it evaluates.
+    """
+
+    def __init__(self, function):
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, positions):
+        self.calls += len(positions)
+        return self.function(positions)
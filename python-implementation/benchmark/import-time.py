@@ -0,0 +1,50 @@
+# Import-time benchmark of the core of the swarm.
+#
+# We launch many short optimization jobs, so the time it takes to import the swarm matters. This script imports it in
+# fresh interpreters, takes the best of several tries, and exits with a non-zero status if the import takes longer
+# than the budget, or if it loads a module the core must not depend on (matplotlib, scipy). The import of numpy, which
+# the core does need, is reported separately.
+#
+# usage: python import-time.py [budget in milliseconds] [tries]
+
+import os
+import subprocess
+import sys
+
+CORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+FORBIDDEN = ("matplotlib", "scipy")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import numpy
+middle = time.perf_counter()
+import swarm
+end = time.perf_counter()
+loaded = [name for name in %r if name in sys.modules]
+print(middle - start, end - middle, ",".join(loaded))
+""" % (FORBIDDEN,)
+
+
+def probe():
+    output = subprocess.run([sys.executable, "-c", PROBE], cwd=CORE, check=True, capture_output=True,
+                            text=True).stdout.split()
+    return float(output[0]), float(output[1]), output[2].split(",") if len(output) > 2 else []
+
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.05
+    tries = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    results = [probe() for _ in range(tries)]
+    numpyTime = min(result[0] for result in results)
+    coreTime = min(result[1] for result in results)
+    loaded = sorted(set(name for result in results for name in result[2]))
+
+    print("import numpy : %7.1f ms" % (1000 * numpyTime))
+    print("import swarm : %7.1f ms (on top of numpy, budget %.1f ms)" % (1000 * coreTime, 1000 * budget))
+    if loaded:
+        print("FAILED: importing the swarm loaded", ", ".join(loaded))
+    if coreTime > budget:
+        print("FAILED: importing the swarm is over budget")
+    sys.exit(1 if loaded or coreTime > budget else 0)
@@ -0,0 +1,52 @@
+# Scaling benchmark of the island model.
+#
+# The objective burns a fixed amount of CPU per position, standing in for an expensive simulation. Every island has
+# the same population and number of iterations (weak scaling), so an ideal run takes the same time with any number of
+# islands. The same seeded run is timed with 1, 2, 4, ... islands up to the number of cores (and with exactly the
+# number of cores), over each transport, and the throughput and the parallel efficiency against 1 island are
+# reported, along with the best fitness found.
+#
+# usage: python island-scaling.py [population per island] [iterations] [milliseconds per evaluation]
+
+from functools import partial
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from functions import expensiveSphere
+from islands import *
+from objective import *
+
+
+def run(islands, transport, population_size, iterations, objective):
+    model = IslandModel(islands, migrationInterval=5, migrants=2, transport=transport, seed=0,
+                        population_size=population_size, dimension=5, maxiterations=iterations, bounds=[-5, 5],
+                        w=0.7, c1=1.5, c2=1.5, mode="min", objective=objective)
+    model.optimize()
+    return model
+
+
+if __name__ == "__main__":
+    population_size = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    milliseconds = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+    objective = ScalarObjective(partial(expensiveSphere, milliseconds=milliseconds))
+
+    counts = []
+    islands = 1
+    while islands < os.cpu_count():
+        counts.append(islands)
+        islands *= 2
+    counts.append(os.cpu_count())
+
+    for transport in (PipeTransport(), SocketTransport()):
+        print(type(transport).__name__)
+        reference = None
+        for islands in counts:
+            model = run(islands, transport, population_size, iterations, objective)
+            if reference is None:
+                reference = model.evaluationsPerSecond
+            print("%3d island(s) : %8.3f s   %10.1f evaluations/s   efficiency %5.1f%%   best %.3e" % (
+                islands, model.elapsed, model.evaluationsPerSecond,
+                100 * model.evaluationsPerSecond / reference / islands, model.gbestFitness))
@@ -0,0 +1,68 @@
+# Benchmark of the hybrid local refinement of gbest.
+#
+# The swarm is run on the same seeds against functions of functions.py until the gbest reaches a target error, or the
+# evaluation budget of the plain swarm (population * (iterations + 1)) runs out, without refinement and with a
+# Refinement by every local search method, triggered when the gbest stagnates. All the runs have the same budget, the
+# local searches included, and every run is checked to stay within it (up to the population evaluated by the last
+# iteration, as the budget is checked after every iteration). The median number of evaluations to the target (counting
+# the runs that missed it at their total), the number of runs that reached it, and the share of the evaluations spent
+# in the local searches are reported.
+#
+# Finally, every method is run once per seed on rastrigin, where the swarm stagnates, with the default Refinement and
+# the default stopping criteria of the swarm (Stagnation(50)), to check that it is refined before it is stopped.
+#
+# usage: python local-refinement.py [dimension] [target] [iterations] [seeds] [functions...]
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from numpy import median
+
+from functions import FUNCTIONS
+from localsearch import LOCAL_SEARCHES, Refinement
+from stopping import EvaluationBudget, TargetFitness
+from swarm import Swarm
+
+if __name__ == "__main__":
+    dimension = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    target = float(sys.argv[2]) if len(sys.argv) > 2 else 1e-8
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    seeds = int(sys.argv[4]) if len(sys.argv) > 4 else 5
+    names = sys.argv[5:] or ["sphere", "rosenbrock", "ackley", "griewank"]
+    population = 40
+    budget = population * (iterations + 1)
+
+    for name in names:
+        function = FUNCTIONS[name]
+        print("%s, dimension %d, target error %g, budget %d evaluations, %d seeds" % (name, dimension, target, budget,
+                                                                                    seeds))
+        for method in [None] + list(LOCAL_SEARCHES):
+            evaluations, reached, local = [], 0, 0
+            for seed in range(seeds):
+                refinement = Refinement(method, window=20, tolerance=1e-3) if method is not None else None
+                swarm = Swarm(population, dimension, iterations, function.bounds, 0.7, 1.5, 1.5, "min",
+                              objective=function, seed=seed, refinement=refinement,
+                              stopping=[TargetFitness(function.optimumFitness + target), EvaluationBudget(budget)])
+                swarm.optimize()
+                if swarm.evaluations >= budget + population:
+                    raise Exception(swarm.evaluations, "evaluations exceed the budget of %d" % budget)
+                evaluations.append(swarm.evaluations)
+                reached += swarm.stopReason == TargetFitness.reason
+                local += refinement.used if refinement is not None else 0
+            print("%-12s: median %9d evaluations   reached %2d/%d   %5.1f%% in local search" % (
+                method or "none", median(evaluations), reached, seeds, 100.0 * local / sum(evaluations)))
+
+    function = FUNCTIONS["rastrigin"]
+    for method in LOCAL_SEARCHES:
+        refined = 0
+        for seed in range(seeds):
+            refinement = Refinement(method)
+            swarm = Swarm(40, dimension, iterations, function.bounds, 0.7, 1.5, 1.5, "min", objective=function,
+                          seed=seed, refinement=refinement)
+            swarm.optimize()
+            refined += refinement.used > 0
+        if refined < seeds:
+            raise Exception(method, "did not refine every run stopped by the default stopping criteria")
+        print("%-12s with the default stopping: %d/%d runs refined" % (method, refined, seeds))
@@ -0,0 +1,98 @@
+# Benchmark of the multi-objective swarm and of its Pareto archive.
+#
+# The swarm is run on ZDT1, ZDT2 (two objectives) and DTLZ2 (three objectives) with both pruning methods of the
+# archive, and the quality of the front is reported as the inverted generational distance (IGD): the mean distance
+# from points sampled on the true Pareto front to the nearest point of the archive, lower is better.
+#
+# The archive itself is then timed as it grows: batches of 100 random candidates around a front are inserted into
+# archives of a few thousand points, with two and three objectives, and the time per batch is reported.
+#
+# usage: python multi-objective.py [iterations] [archive sizes...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from numpy import column_stack, cos, linspace, meshgrid, pi, sin, sqrt
+from numpy.random import default_rng
+
+from multiobjective import MultiObjectiveSwarm
+from pareto import ParetoArchive
+
+
+def zdt1(x):
+    g = 1 + 9 * x[:, 1:].mean(axis=1)
+    return column_stack((x[:, 0], g * (1 - sqrt(x[:, 0] / g))))
+
+
+def zdt2(x):
+    g = 1 + 9 * x[:, 1:].mean(axis=1)
+    return column_stack((x[:, 0], g * (1 - (x[:, 0] / g) ** 2)))
+
+
+def dtlz2(x):
+    g = 1 + ((x[:, 2:] - 0.5) ** 2).sum(axis=1)
+    a, b = x[:, 0] * pi / 2, x[:, 1] * pi / 2
+    return column_stack((g * cos(a) * cos(b), g * cos(a) * sin(b), g * sin(a)))
+
+
+def sphereFront(count):
+    a, b = [values.ravel() for values in meshgrid(linspace(0, pi / 2, count), linspace(0, pi / 2, count))]
+    return column_stack((cos(a) * cos(b), cos(a) * sin(b), sin(a)))
+
+
+def hyperplane(rng, count, objectives):
+    """
+    :return: (count, objectives) array of random integer points whose last objective is minus the sum of the others
+    """
+    points = rng.integers(0, 10 ** 9, (count, objectives)).astype(float)
+    points[:, -1] = -points[:, :-1].sum(axis=1)
+    return points
+
+
+f1 = linspace(0, 1, 1000)
+# name: (objective, number of variables, number of objectives, points of the true front)
+PROBLEMS = {
+    "zdt1": (zdt1, 30, 2, column_stack((f1, 1 - sqrt(f1)))),
+    "zdt2": (zdt2, 30, 2, column_stack((f1, 1 - f1 ** 2))),
+    "dtlz2": (dtlz2, 12, 3, sphereFront(40)),
+}
+
+
+def igd(front, archive):
+    """
+    :return: mean distance from every point of the true front to the nearest point of the archive
+    """
+    return sqrt(((front[:, None, :] - archive.fitness[None, :, :]) ** 2).sum(axis=2).min(axis=1)).mean()
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    sizes = [int(size) for size in sys.argv[2:]] or [1000, 5000, 20000]
+
+    for name, (objective, dimension, objectives, front) in PROBLEMS.items():
+        for pruning in ("crowding", "grid"):
+            swarm = MultiObjectiveSwarm(100, dimension, iterations, [0, 1], 0.4, 1.5, 1.5, "min", objectives,
+                                        archive=ParetoArchive(100, pruning=pruning), objective=objective,
+                                        boundary="clip", seed=0)
+            start = time.perf_counter()
+            archive = swarm.optimize()
+            print("%-6s %-8s: %4d points   IGD %.5f   %6.2f s" % (
+                name, pruning, len(archive), igd(front, archive), time.perf_counter() - start))
+
+    rng = default_rng(0)
+    for objectives in (2, 3):
+        for size in sizes:
+            archive = ParetoArchive(size)
+            # integer points whose last objective is minus the sum of the others are mutually non-dominated (or equal)
+            while len(archive) < size:
+                points = hyperplane(rng, 1000, objectives)
+                archive.insert(points, points)
+            start, batches = time.perf_counter(), 50
+            for _ in range(batches):
+                points = hyperplane(rng, 100, objectives) + rng.integers(-1000, 1000, (100, objectives))
+                archive.insert(points, points)
+            print("%d objectives, archive of %6d points: %8.3f ms per batch of 100 candidates" % (
+                objectives, size, 1000 * (time.perf_counter() - start) / batches))
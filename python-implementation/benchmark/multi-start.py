@@ -0,0 +1,46 @@
+# Benchmark of the early stopping of a multi-start.
+#
+# The same seeded multi-start is run against functions of functions.py with and without earlyStop, and the best and
+# median fitness over the runs, the number of runs stopped early and the total evaluations are reported. Sphere has
+# its optimum at 0, where a margin relative to the best fitness alone shrinks to nothing, so every converging run would
+# be stopped as soon as another run is a few orders of magnitude ahead. On sphere no run within the absolute tolerance
+# of the margin of the optimum is checked to have been stopped early.
+#
+# usage: python multi-start.py [runs] [dimension] [iterations] [functions...]
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from functions import FUNCTIONS
+from restarts import DominatedRun, MultiStart
+
+
+def run(function, runs, dimension, iterations, earlyStop):
+    multiStart = MultiStart(runs, seed=0, earlyStop=earlyStop, population_size=20, dimension=dimension,
+                            maxiterations=iterations, bounds=function.bounds, w=0.7, c1=1.5, c2=1.5, mode="min",
+                            objective=function, stopping=[])
+    multiStart.optimize()
+    return multiStart
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    dimension = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    names = sys.argv[4:] or ["sphere", "rastrigin", "ackley"]
+
+    for name in names:
+        function = FUNCTIONS[name]
+        print("%s, %d runs, dimension %d, %d iterations" % (name, runs, dimension, iterations))
+        for earlyStop in (False, True):
+            multiStart = run(function, runs, dimension, iterations, earlyStop)
+            statistics = multiStart.statistics()
+            print("earlyStop %-5s: best %11.4g   median %11.4g   %3d stopped early   %9d evaluations   %7.2f s" % (
+                earlyStop, statistics["bestFitness"], statistics["medianFitness"], statistics["stoppedEarly"],
+                statistics["evaluations"], statistics["elapsed"]))
+        if name == "sphere":
+            for result in multiStart.results:
+                if result.stopReason == DominatedRun.reason and result.gbestFitness < multiStart.tolerance:
+                    raise Exception(result.gbestFitness, "run %d stopped early at the optimum" % result.index)
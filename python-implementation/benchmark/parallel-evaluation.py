@@ -0,0 +1,48 @@
+# Benchmark of the parallel fitness evaluation of the swarm.
+#
+# The objective burns a fixed amount of CPU per position, standing in for an expensive simulation. The same seeded run
+# is timed serially and with 1, 2, 4, ... workers up to the number of cores, the speedup over the serial run is
+# reported, and every parallel run is checked to end on exactly the same gbest as the serial one.
+#
+# usage: python parallel-evaluation.py [population_size] [iterations] [milliseconds per evaluation]
+# (keep iterations below 50 so the convergence check can't end a run early)
+
+from functools import partial
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from numpy import array_equal
+
+from functions import expensiveSphere
+from swarm import *
+
+
+def run(population_size, iterations, objective, workers):
+    with Swarm(population_size, 5, iterations, [-5, 5], 0.7, 1.5, 1.5, "min", objective=objective,
+               workers=workers, seed=0) as swarm:
+        start = time.perf_counter()
+        swarm.optimize()
+        return time.perf_counter() - start, swarm.gbest
+
+
+if __name__ == "__main__":
+    population_size = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    milliseconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    objective = ScalarObjective(partial(expensiveSphere, milliseconds=milliseconds))
+
+    serialTime, serialGbest = run(population_size, iterations, objective, None)
+    results = []
+    workers = 1
+    while workers <= os.cpu_count():
+        parallelTime, parallelGbest = run(population_size, iterations, objective, workers)
+        results.append((workers, parallelTime, array_equal(parallelGbest, serialGbest)))
+        workers *= 2
+
+    print("serial        : %8.3f s" % serialTime)
+    for workers, parallelTime, identical in results:
+        print("%2d worker(s)  : %8.3f s   speedup %5.2fx   efficiency %5.1f%%   identical to serial: %s" % (
+            workers, parallelTime, serialTime / parallelTime, 100 * serialTime / parallelTime / workers, identical))
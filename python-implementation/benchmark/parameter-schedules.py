@@ -0,0 +1,55 @@
+# Benchmark of the parameter schedules of the swarm.
+#
+# Every configuration of w, c1, c2 (and vmax) is run on the same seeds against a function of functions.py until the
+# gbest reaches a target fitness, or the iteration budget runs out. The median number of iterations and evaluations
+# to the target, and the number of runs that reached it, are reported. The first configuration is the one of
+# test/rosenbrock-function, w = 1 and c1 = c2 = 2.
+#
+# usage: python parameter-schedules.py [function] [dimension] [target] [iterations] [seeds]
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from numpy import median
+
+from functions import FUNCTIONS
+from swarm import Swarm
+from schedules import *
+from stopping import TargetFitness
+
+CONFIGURATIONS = {
+    "constant w=1 c=2": lambda width: dict(w=1.0, c1=2.0, c2=2.0),
+    "constant w=0.7": lambda width: dict(w=0.7, c1=1.5, c2=1.5),
+    "linear w 0.9-0.4": lambda width: dict(w=Linear(0.9, 0.4), c1=1.5, c2=1.5),
+    "exponential w 0.9-0.4": lambda width: dict(w=Exponential(0.9, 0.4), c1=1.5, c2=1.5),
+    "constriction": lambda width: dict(zip(("w", "c1", "c2"), constriction())),
+    "time-varying c1, c2": lambda width: dict(w=Linear(0.9, 0.4), c1=Linear(2.5, 0.5), c2=Linear(0.5, 2.5)),
+    "diversity-adaptive w": lambda width: dict(w=DiversityAdaptive(), c1=1.5, c2=1.5),
+    "constant w=1 c=2 + vmax": lambda width: dict(w=1.0, c1=2.0, c2=2.0, vmax=0.2 * width),
+    "linear w 0.9-0.4 + vmax": lambda width: dict(w=Linear(0.9, 0.4), c1=1.5, c2=1.5, vmax=0.2 * width),
+}
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else "rosenbrock"
+    dimension = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    target = float(sys.argv[3]) if len(sys.argv) > 3 else 1e-6
+    iterations = int(sys.argv[4]) if len(sys.argv) > 4 else 5000
+    seeds = int(sys.argv[5]) if len(sys.argv) > 5 else 10
+    function = FUNCTIONS[name]
+    lower, upper = function.bounds
+
+    print("%s, %d variables, target %g, %d iterations, %d seeds" % (name, dimension, target, iterations, seeds))
+    for label, configuration in CONFIGURATIONS.items():
+        reached, runIterations, runEvaluations = 0, [], []
+        for seed in range(seeds):
+            swarm = Swarm(50, dimension, iterations, function.bounds, mode="min", objective=function,
+                          stopping=[TargetFitness(target)], seed=seed, **configuration(upper - lower))
+            swarm.optimize()
+            reached += swarm.stopReason is not None
+            runIterations.append(swarm.iteration)
+            runEvaluations.append(swarm.evaluations)
+        print("%-26s: reached %2d/%d   median %7d iterations   %9d evaluations" % (
+            label, reached, seeds, median(runIterations), median(runEvaluations)))
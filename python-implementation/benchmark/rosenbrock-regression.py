@@ -0,0 +1,45 @@
+# Regression benchmark: the swarm must find the known optimum of the 3 variable Rosenbrock function of
+# test/rosenbrock-function, f(1, 1, 1) = 0, within a fixed number of iterations. Every seed is run, and the script
+# exits with a non-zero status if any run ends farther than the tolerance from (1, 1, 1).
+#
+# usage: python rosenbrock-regression.py [iterations] [seeds]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from numpy import array, sqrt
+
+from swarm import *
+
+OPTIMUM = array([1.0, 1.0, 1.0])
+TOLERANCE = 1e-3
+
+
+def rosenbrock(positions):
+    """
+    Rosenbrock function for n = 3 as written in test/rosenbrock-function, for a batch of positions.
+    """
+    x1, x2, x3 = positions[:, 0], positions[:, 1], positions[:, 2]
+    return (100 * (x2 - x1) ** 2 + (1 - x1) ** 2) + (100 * (x3 - x2) ** 2 + (1 - x2) ** 2)
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seeds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    failures = 0
+    for seed in range(seeds):
+        swarm = Swarm(100, 3, iterations, [-10, 10], 0.7298, 1.49618, 1.49618, "min", objective=rosenbrock,
+                      stopping=[], seed=seed)
+        start = time.perf_counter()
+        gbest = swarm.optimize()
+        error = sqrt(((gbest - OPTIMUM) ** 2).sum())
+        failures += error > TOLERANCE
+        print("seed %d: gbest %s   fitness %.3e   distance to optimum %.3e   %.2f s   %s" % (
+            seed, gbest, swarm.gbestFitness, error, time.perf_counter() - start,
+            "ok" if error <= TOLERANCE else "FAILED"))
+
+    sys.exit(1 if failures else 0)
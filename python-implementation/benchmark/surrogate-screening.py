@@ -0,0 +1,74 @@
+# Benchmark of the surrogate pre-screening of the swarm.
+#
+# The swarm is run on the same seeds against functions of functions.py, without screening and with a Screening on the
+# k-nearest-neighbour and on the local radial basis function surrogate. For every configuration the median final
+# error, the objective calls actually made, the calls saved by the screening, and the wall-clock time are reported.
+# The last column is the median error of the plain swarm after the same number of objective calls as the screened
+# run, read from its convergence history, to tell whether the calls saved were worth it.
+#
+# With the defaults the screening roughly halves the objective calls, but at equal calls the plain swarm reaches a
+# lower error in 7 of the 8 function and model pairs (the exception is the radial basis model on rastrigin, by about
+# 10%), and the screened runs take 20 to 40 times the wall-clock time of the plain ones on these cheap functions. The
+# screening only pays off for an objective much more expensive than the prediction of a population, and even then
+# this benchmark does not show a better error for the same number of calls.
+#
+# usage: python surrogate-screening.py [dimension] [iterations] [seeds] [functions...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from numpy import median
+
+from functions import FUNCTIONS, CountedObjective
+from surrogate import NearestNeighbors, RadialBasis, Screening
+from swarm import Swarm
+
+POPULATION = 40
+
+# name: function creating the screening of a run, None for the plain swarm
+CONFIGURATIONS = {
+    "none": lambda: None,
+    "knn": lambda: Screening(NearestNeighbors()),
+    "rbf": lambda: Screening(RadialBasis()),
+}
+
+
+def run(function, dimension, iterations, seed, screening):
+    """
+    :return: the swarm after the run, and the number of objective calls it made
+    """
+    objective = CountedObjective(function)
+    swarm = Swarm(POPULATION, dimension, iterations, function.bounds, 0.7, 1.5, 1.5, "min", objective=objective,
+                  stopping=[], seed=seed, screening=screening)
+    swarm.optimize()
+    return swarm, objective.calls
+
+
+if __name__ == "__main__":
+    dimension = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    seeds = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    names = sys.argv[4:] or ["sphere", "rosenbrock", "rastrigin", "ackley"]
+
+    for name in names:
+        function = FUNCTIONS[name]
+        print("%s, dimension %d, %d iterations, %d seeds" % (name, dimension, iterations, seeds))
+        histories = [run(function, dimension, iterations, seed, None)[0].allGbests for seed in range(seeds)]
+        for configuration, screening in CONFIGURATIONS.items():
+            errors, calls, saved, matched = [], 0, 0, []
+            start = time.perf_counter()
+            for seed in range(seeds):
+                swarm, count = run(function, dimension, iterations, seed, screening())
+                errors.append(swarm.gbestFitness - function.optimumFitness)
+                calls += count
+                saved += swarm.screenedEvaluations
+                # the plain swarm makes POPULATION calls for the initial population, then POPULATION per iteration
+                history = histories[seed]
+                matched.append(history[max(0, min(len(history), count // POPULATION - 1) - 1)] -
+                               function.optimumFitness)
+            print("%-5s: median error %11.4g   %8d objective calls   %8d saved   %7.2f s   plain swarm at same calls "
+                  "%11.4g" % (configuration, median(errors), calls, saved, time.perf_counter() - start,
+                              median(matched)))
@@ -0,0 +1,134 @@
+from numpy import asarray, broadcast_to, clip, count_nonzero, mod, not_equal, where
+
+
+def parseBounds(bounds, dimension):
+    """
+    Function to turn the bounds given to the swarm into one lower and one upper bound per variable.
+
+    :param bounds: [lower-bound, upper-bound], each either a number shared by all the variables or a sequence with one
+                   value per variable
+    :param dimension: number of variables in each particle
+    :return: lower, upper - float arrays of shape (dimension,)
+    """
+    if len(bounds) != 2:
+        raise Exception(bounds, "is not a valid parameter, bounds must be [lower-bound, upper-bound]")
+    lower = broadcast_to(asarray(bounds[0], dtype=float), (dimension,)).copy()
+    upper = broadcast_to(asarray(bounds[1], dtype=float), (dimension,)).copy()
+    if (lower > upper).any():
+        raise Exception(bounds, "is not a valid parameter, every lower-bound must not exceed its upper-bound")
+    return lower, upper
+
+
+def outsideBounds(positions, lower, upper, scratch=None, mask=None):
+    """
+    Function to find the coordinates that lie outside the bounds, i.e. those that clipping to the bounds changes.
+
+    :param positions: (n, dimension) array of positions
+    :param lower: (dimension,) array of lower bounds
+    :param upper: (dimension,) array of upper bounds
+    :param scratch: optional (n, dimension) array like positions, overwritten, to work without allocating
+    :param mask: optional (n, dimension) boolean array the result is written to
+    :return: (n, dimension) boolean mask, True for every coordinate outside its bounds
+    """
+    return not_equal(clip(positions, lower, upper, out=scratch), positions, out=mask)
+
+
+def clipToBounds(positions, velocities, lower, upper, rng, scratch=None, mask=None):
+    """
+    Function to move every coordinate outside the bounds onto the nearest bound, the velocity is left unchanged.
+
+    All the boundary strategies take the positions and velocities of the swarm (or of some of its rows), the bounds and
+    the random number generator of the swarm, repair the positions and velocities in place, and return the number of
+    coordinates that were outside the bounds. The swarm passes them preallocated work arrays as well.
+
+    :param positions: (n, dimension) array of positions, repaired in place
+    :param velocities: (n, dimension) array of velocities, repaired in place
+    :param lower: (dimension,) array of lower bounds
+    :param upper: (dimension,) array of upper bounds
+    :param rng: numpy.random.Generator used by strategies that draw random numbers
+    :param scratch: optional (n, dimension) work array like positions
+    :param mask: optional (n, dimension) boolean work array; given both, a step that leaves every coordinate within
+                 the bounds allocates nothing
+    :return: number of coordinates that were outside the bounds
+    """
+    outside = outsideBounds(positions, lower, upper, scratch, mask)
+    clip(positions, lower, upper, out=positions)
+    return count_nonzero(outside)
+
+
+def reflectIntoBounds(positions, velocities, lower, upper, rng, scratch=None, mask=None):
+    """
+    Function to reflect every coordinate outside the bounds back into them, as if the bounds were mirrors. Overshoots
+    larger than the width of the domain are folded as many times as needed. The velocity of a reflected coordinate
+    changes its sign.
+
+    :param positions: (n, dimension) array of positions, repaired in place
+    :param velocities: (n, dimension) array of velocities, repaired in place
+    :param lower: (dimension,) array of lower bounds
+    :param upper: (dimension,) array of upper bounds
+    :param rng: numpy.random.Generator used by strategies that draw random numbers
+    :param scratch: optional work space, see clipToBounds
+    :param mask: optional work space, see clipToBounds
+    :return: number of coordinates that were outside the bounds
+    """
+    outside = outsideBounds(positions, lower, upper, scratch, mask)
+    count = count_nonzero(outside)
+    if count:
+        low = broadcast_to(lower, positions.shape)[outside]
+        width = broadcast_to(upper, positions.shape)[outside] - low
+        # a variable with lower == upper has no room to fold into: it is clamped to its bound
+        flat = width == 0
+        folded = mod(positions[outside] - low, where(flat, 1, 2 * width))
+        positions[outside] = low + where(flat, 0, where(folded > width, 2 * width - folded, folded))
+        velocities[outside] = -velocities[outside]
+    return count
+
+
+def redrawInBounds(positions, velocities, lower, upper, rng, scratch=None, mask=None):
+    """
+    Function to redraw every coordinate outside the bounds uniformly within its bounds, the velocity is left
+    unchanged.
+
+    :param positions: (n, dimension) array of positions, repaired in place
+    :param velocities: (n, dimension) array of velocities, repaired in place
+    :param lower: (dimension,) array of lower bounds
+    :param upper: (dimension,) array of upper bounds
+    :param rng: numpy.random.Generator used by strategies that draw random numbers
+    :param scratch: optional work space, see clipToBounds
+    :param mask: optional work space, see clipToBounds
+    :return: number of coordinates that were outside the bounds
+    """
+    outside = outsideBounds(positions, lower, upper, scratch, mask)
+    count = count_nonzero(outside)
+    if count:
+        positions[outside] = rng.uniform(low=broadcast_to(lower, positions.shape)[outside],
+                                         high=broadcast_to(upper, positions.shape)[outside])
+    return count
+
+
+def absorbAtBounds(positions, velocities, lower, upper, rng, scratch=None, mask=None):
+    """
+    Function to stop every coordinate outside the bounds on the nearest bound, and set its velocity to zero.
+
+    :param positions: (n, dimension) array of positions, repaired in place
+    :param velocities: (n, dimension) array of velocities, repaired in place
+    :param lower: (dimension,) array of lower bounds
+    :param upper: (dimension,) array of upper bounds
+    :param rng: numpy.random.Generator used by strategies that draw random numbers
+    :param scratch: optional work space, see clipToBounds
+    :param mask: optional work space, see clipToBounds
+    :return: number of coordinates that were outside the bounds
+    """
+    outside = outsideBounds(positions, lower, upper, scratch, mask)
+    clip(positions, lower, upper, out=positions)
+    velocities[outside] = 0
+    return count_nonzero(outside)
+
+
+# boundary strategies selectable by name in the swarm
+BOUNDARY_STRATEGIES = {
+    "clip": clipToBounds,
+    "reflect": reflectIntoBounds,
+    "random": redrawInBounds,
+    "absorb": absorbAtBounds,
+}
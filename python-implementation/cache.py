@@ -0,0 +1,129 @@
+from collections import OrderedDict
+
+from numpy import ascontiguousarray, asarray, empty, int64, ones, rint
+
+
+class FitnessCache:
+    """
+    This class is a memoizing cache in front of a batched objective, for objectives that are expensive enough that
+    looking positions up in a dict is cheap in comparison.
+
+    Positions are quantized to a grid of the given resolution before being looked up, so that positions closer than
+    the resolution share one entry; the cached fitness is that of the first position evaluated in the cell. Without a
+    resolution, only bit-identical positions hit. At most maxsize entries are kept, the least recently used ones are
+    evicted first.
+
+    The cache lives in the process that calls it. When it is used with a parallel objective, only the positions that
+    miss are sent to the workers, in one batch, and the statistics stay in one place.
+
+    """
+
+    def __init__(self, maxsize=100000, resolution=None, objective=None):
+        """
+        Function to create an empty cache.
+
+        :param maxsize: largest number of entries kept
+        :param resolution: size of the quantization grid, a number or one value per variable, None for exact matches
+        :param objective: batched fitness function behind the cache; when the cache is given to a swarm, the swarm
+                          sets it to its own objective
+        """
+        self.maxsize = maxsize
+        self.resolution = None if resolution is None else asarray(resolution, dtype=float)
+        self.objective = objective
+        self.entries = OrderedDict()  # key of a position -> fitness, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, positions):
+        """
+        Function to evaluate a batch of positions, calling the objective only for the ones not in the cache. Positions
+        of the batch that share a key are evaluated once.
+
+        :param positions: (n, dimension) array of positions whose fitness is to be evaluated
+        :return: array of n fitness values
+        """
+        keys = self.keys(positions)
+        fitness, missing = self.lookup(positions, keys)
+        if missing.any():
+            first = {}  # key -> index of the first missing position with that key
+            for i in missing.nonzero()[0]:
+                first.setdefault(keys[i], i)
+            unique = list(first.values())
+            values = asarray(self.objective(positions[unique]), dtype=float).reshape(-1)
+            self.store(positions[unique], values, list(first))
+            evaluated = dict(zip(first, values))
+            for i in missing.nonzero()[0]:
+                fitness[i] = evaluated[keys[i]]
+        return fitness
+
+    def keys(self, positions):
+        """
+        Function to compute the cache keys of a batch of positions.
+
+        :param positions: (n, dimension) array of positions
+        :return: list of n hashable keys
+        """
+        if self.resolution is None:
+            cells = ascontiguousarray(positions, dtype=float)
+        else:
+            cells = ascontiguousarray(rint(positions / self.resolution), dtype=int64)
+        return [row.tobytes() for row in cells]
+
+    def lookup(self, positions, keys=None):
+        """
+        Function to look a batch of positions up in the cache.
+
+        :param positions: (n, dimension) array of positions
+        :param keys: their keys, if they were already computed
+        :return: fitness, missing - array of n fitness values, valid where missing is False, and boolean mask of the
+                 positions that are not in the cache
+        """
+        fitness = empty(len(positions))
+        missing = ones(len(positions), dtype=bool)
+        for i, key in enumerate(keys if keys is not None else self.keys(positions)):
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                fitness[i] = value
+                missing[i] = False
+        hits = len(positions) - int(missing.sum())
+        self.hits += hits
+        self.misses += len(positions) - hits
+        return fitness, missing
+
+    def store(self, positions, fitness, keys=None):
+        """
+        Function to add evaluated positions to the cache, evicting the least recently used entries if it is full.
+
+        :param positions: (n, dimension) array of positions
+        :param fitness: array of their n fitness values
+        :param keys: their keys, if they were already computed
+        """
+        for key, value in zip(keys if keys is not None else self.keys(positions), fitness):
+            self.entries[key] = float(value)
+            self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def hitRate(self):
+        """
+        :return: fraction of the lookups that were served from the cache
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def statistics(self):
+        """
+        :return: dict with the hits, misses, evictions, hit rate and current size of the cache
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "hitRate": self.hitRate(),
+                "size": len(self.entries)}
+
+    def clear(self):
+        """
+        Function to empty the cache and reset its statistics.
+        """
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,32 @@
+import os
+
+from numpy import load, savez
+
+
+def writeCheckpoint(path, arrays):
+    """
+    Function to write arrays to a checkpoint file atomically.
+
+    The arrays are dumped uncompressed, in bulk, in NumPy's .npz format to a temporary file next to path, which is then
+    renamed over path. A crash during the write therefore leaves the previous checkpoint intact, never a truncated one.
+
+    :param path: path of the checkpoint file
+    :param arrays: dict of name -> array (or number, or string) to be saved
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as checkpointFile:
+        savez(checkpointFile, **arrays)
+        checkpointFile.flush()
+        os.fsync(checkpointFile.fileno())
+    os.replace(temporary, path)
+
+
+def readCheckpoint(path):
+    """
+    Function to read all the arrays of a checkpoint file written by writeCheckpoint.
+
+    :param path: path of the checkpoint file
+    :return: dict of name -> array
+    """
+    with load(path, allow_pickle=False) as checkpointFile:
+        return {name: checkpointFile[name] for name in checkpointFile.files}
@@ -0,0 +1,198 @@
+from numpy import absolute, arange, argmin, asarray, empty, flatnonzero, full, inf, lexsort, maximum, zeros
+
+# ways of handling the constraints, see Constraints
+METHODS = ("feasibility", "penalty", "adaptive")
+
+
+class Constraint:
+    """
+    This class is one batched constraint of the problem: a function taking an (n, dimension) array of positions and
+    returning, for every position, one value or a row of values (several constraints computed together).
+
+    An inequality constraint is satisfied where its values are <= 0, an equality constraint where they are 0 within a
+    tolerance. The violation of a position is the sum over the values of max(0, value) for inequalities, and of
+    max(0, |value| - tolerance) for equalities, so it is 0 exactly for the positions that satisfy the constraint.
+
+    """
+
+    def __init__(self, function, kind="inequality", cheap=False, tolerance=1e-6):
+        """
+        :param function: batched constraint function
+        :param kind: "inequality" (function(x) <= 0) or "equality" (function(x) = 0)
+        :param cheap: True for constraints that are checked before the objective is evaluated, so that the objective
+                      is skipped for the positions that violate them
+        :param tolerance: largest absolute value of an equality constraint that still counts as satisfied
+        """
+        if kind not in ("inequality", "equality"):
+            raise Exception(kind, "is not a valid parameter, accepted parameters: 'inequality' or 'equality'")
+        self.function = function
+        self.kind = kind
+        self.cheap = cheap
+        self.tolerance = tolerance
+
+    def violation(self, positions):
+        """
+        Function to compute how much a batch of positions violates the constraint.
+
+        :param positions: (n, dimension) array of positions
+        :return: float array of n violations, 0 where the constraint is satisfied
+        """
+        values = asarray(self.function(positions), dtype=float).reshape(len(positions), -1)
+        if self.kind == "equality":
+            values = absolute(values) - self.tolerance
+        return maximum(values, 0.0).sum(axis=1)
+
+
+class Constraints:
+    """
+    This class holds the constraints of the problem and the way the swarm handles them.
+
+    "feasibility" applies Deb's feasibility rules to every comparison of the swarm (pbests and gbest): a feasible
+    position beats an infeasible one, two feasible positions are compared by fitness, and two infeasible ones by
+    violation. "penalty" compares fitness + penalty * violation (fitness - penalty * violation when maximizing), with
+    a fixed penalty. "adaptive" does the same with a penalty that is multiplied by increase after window iterations in
+    a row with an infeasible gbest, and divided by decrease after window iterations in a row with a feasible one. Ties
+    of the penalized fitness, e.g. between positions whose objective was skipped, are broken by violation.
+
+    The constraints marked cheap are checked first, and with skip the objective is not evaluated for the positions
+    that violate them: those get the worst possible fitness, and are counted in swarm.skippedEvaluations. The other
+    constraints are still computed for them, the objective being the expensive part.
+
+    """
+
+    def __init__(self, constraints, method="feasibility", penalty=1000.0, skip=True, window=10, increase=2.0,
+                 decrease=1.5):
+        """
+        :param constraints: list of Constraint
+        :param method: "feasibility", "penalty" or "adaptive"
+        :param penalty: penalty per unit of violation, the initial one for "adaptive"
+        :param skip: if True, don't evaluate the objective for positions that violate a cheap constraint
+        :param window: number of iterations the gbest must stay feasible (or infeasible) to adapt the penalty
+        :param increase: factor the adaptive penalty is multiplied by while the gbest is infeasible
+        :param decrease: factor the adaptive penalty is divided by while the gbest is feasible
+        """
+        if method not in METHODS:
+            raise Exception(method, "is not a valid parameter, accepted parameters: " + ", ".join(METHODS))
+        self.constraints = list(constraints)
+        self.method = method
+        self.penalty = penalty
+        self.skip = skip
+        self.window = window
+        self.increase = increase
+        self.decrease = decrease
+        self.streak = 0  # iterations in a row with a feasible (> 0) or an infeasible (< 0) gbest
+
+    def violation(self, positions, cheap=None):
+        """
+        Function to compute the total violation of a batch of positions.
+
+        :param positions: (n, dimension) array of positions
+        :param cheap: True or False to only use the cheap or the other constraints, None for all of them
+        :return: float array of n violations, 0 for the positions that satisfy every constraint used
+        """
+        total = zeros(len(positions))
+        for constraint in self.constraints:
+            if cheap is None or constraint.cheap == cheap:
+                total += constraint.violation(positions)
+        return total
+
+    def score(self, positions, evaluate, mode, selected=None):
+        """
+        Function to evaluate a batch of positions: the cheap constraints first, then the other constraints, and the
+        objective only for the positions that satisfy the cheap ones (for all of them without skip). Only the
+        objective is skipped, so that the violation of every position is complete and can be compared.
+
+        :param positions: (n, dimension) array of positions
+        :param evaluate: function evaluating the objective on an array of positions
+        :param mode: "min" or "max", the mode of the problem, for the fitness given to skipped positions
+        :param selected: optional boolean mask of the positions the objective may be evaluated for, see Screening
+        :return: fitness, violation, evaluated - float arrays of n values, and the boolean mask of the positions
+                 evaluated with the objective, None if all of them were
+        """
+        violation = self.violation(positions, cheap=True)
+        evaluated = selected
+        if self.skip:
+            evaluated = violation == 0 if selected is None else selected & (violation == 0)
+        violation += self.violation(positions, cheap=False)
+        if evaluated is None or evaluated.all():
+            return evaluate(positions), violation, None
+        fitness = full(len(positions), inf if mode == "min" else -inf)
+        if evaluated.any():
+            fitness[evaluated] = evaluate(positions[evaluated])
+        return fitness, violation, evaluated
+
+    def penalized(self, fitness, violation, mode):
+        """
+        :return: the fitness with the current penalty applied, for the "penalty" and "adaptive" methods
+        """
+        if mode == "min":
+            return fitness + self.penalty * violation
+        return fitness - self.penalty * violation
+
+    def better(self, fitness, violation, otherFitness, otherViolation, isBetter, mode):
+        """
+        Function to compare positions according to the method, elementwise on arrays.
+
+        :param isBetter: comparison of plain fitness values of the swarm
+        :return: True where (fitness, violation) is strictly better than (otherFitness, otherViolation)
+        """
+        if self.method == "feasibility":
+            return (violation < otherViolation) | ((violation == otherViolation) & isBetter(fitness, otherFitness))
+        penalized, otherPenalized = self.penalized(fitness, violation, mode), self.penalized(otherFitness,
+                                                                                           otherViolation, mode)
+        return isBetter(penalized, otherPenalized) | ((penalized == otherPenalized) & (violation < otherViolation))
+
+    def best(self, fitness, violation, bestOf, mode):
+        """
+        Function to find the best of a batch of positions according to the method.
+
+        :param bestOf: function finding the best of plain fitness values of the swarm
+        :return: index of the best position
+        """
+        if self.method == "feasibility":
+            candidates = flatnonzero(violation == violation.min())
+            return candidates[bestOf(fitness[candidates])]
+        penalized = self.penalized(fitness, violation, mode)
+        candidates = flatnonzero(penalized == penalized[bestOf(penalized)])
+        return candidates[argmin(violation[candidates])]
+
+    def order(self, fitness, violation, mode):
+        """
+        Function to sort a batch of positions according to the method.
+
+        :return: indices of the positions, best first
+        """
+        if self.method == "feasibility":
+            return lexsort((fitness if mode == "min" else -fitness, violation))
+        penalized = self.penalized(fitness, violation, mode)
+        return lexsort((violation, penalized if mode == "min" else -penalized))
+
+    def ranks(self, fitness, violation, mode):
+        """
+        Function to rank a batch of positions according to the method, e.g. to find the best of every neighbourhood
+        with a plain argmin.
+
+        :return: float array of the rank of every position, 0 for the best
+        """
+        ranks = empty(len(fitness))
+        ranks[self.order(fitness, violation, mode)] = arange(len(fitness))
+        return ranks
+
+    def adapt(self, feasible):
+        """
+        Function to adapt the penalty of the "adaptive" method after an iteration.
+
+        :param feasible: True if the gbest is feasible
+        :return: True if the penalty changed, so the gbest must be searched again
+        """
+        if self.method != "adaptive":
+            return False
+        if feasible:
+            self.streak = self.streak + 1 if self.streak > 0 else 1
+        else:
+            self.streak = self.streak - 1 if self.streak < 0 else -1
+        if abs(self.streak) < self.window:
+            return False
+        self.penalty = self.penalty / self.decrease if self.streak > 0 else self.penalty * self.increase
+        self.streak = 0
+        return True
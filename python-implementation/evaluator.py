@@ -0,0 +1,106 @@
+import os
+
+from numpy import array_split, asarray, concatenate
+
+
+class ParallelEvaluator:
+    """
+    This class evaluates a batched objective on a pool of workers.
+
+    Every call splits the (n, dimension) array of positions row-wise into chunks, evaluates each chunk with the wrapped
+    objective on a worker, and joins the results back in order. Since the swarm draws all of its random numbers in the
+    calling process and every row is scored independently, the fitness values are exactly the ones the serial path
+    would produce.
+
+    The pool is started on the first call and reused for every later call, so a run pays the worker start-up cost
+    once. Call close() (or use the evaluator as a context manager) to shut the workers down.
+
+    With the "process" backend the objective, and every chunk of positions, is pickled to the worker processes, so
+    the objective must be picklable, e.g. a module level function or a ScalarObjective wrapping one. The "thread"
+    backend has no such restriction, but only helps for objectives that release the GIL (NumPy heavy code, external
+    programs, I/O).
+
+    """
+
+    def __init__(self, objective, workers=None, chunksize=None, backend="process"):
+        """
+        Function to store the objective and the pool configuration.
+
+        :param objective: batched fitness function, taking an (n, dimension) array and returning n fitness values
+        :param workers: number of worker processes/threads, defaults to the number of cores
+        :param chunksize: number of positions sent to a worker at once, defaults to an even split over the workers
+        :param backend: "process" for a process pool, "thread" for a thread pool
+        """
+        if backend not in ("process", "thread"):
+            raise Exception(backend, "is not a valid parameter, accepted parameters: 'process' or 'thread'")
+        self.objective = objective
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.chunksize = chunksize
+        self.backend = backend
+        self.executor = None
+
+    def __call__(self, positions):
+        """
+        Function to evaluate the objective on a batch of positions using the worker pool.
+
+        :param positions: (n, dimension) array of positions whose fitness is to be evaluated
+        :return: array of n fitness values, in the order of positions, or (n, objectives) array for objectives that
+                 return several values per position
+        """
+        if self.executor is None:
+            self.start()
+        chunks = self.split(positions)
+        results = self.executor.map(self.objective, chunks)
+        fitness = concatenate([asarray(result, dtype=float).reshape(len(chunk), -1)
+                               for chunk, result in zip(chunks, results)])
+        return fitness[:, 0] if fitness.shape[1] == 1 else fitness
+
+    def submit(self, positions):
+        """
+        Function to evaluate one batch of positions asynchronously on a single worker.
+
+        :param positions: (n, dimension) array of positions, it must not be modified until the result is ready
+        :return: concurrent.futures.Future that resolves to the n fitness values
+        """
+        if self.executor is None:
+            self.start()
+        return self.executor.submit(self.objective, positions)
+
+    def split(self, positions):
+        """
+        Function to split a batch of positions row-wise into the chunks dispatched to the workers.
+
+        :param positions: (n, dimension) array of positions
+        :return: list of contiguous (k, dimension) arrays
+        """
+        if self.chunksize is None:
+            nchunks = self.workers
+        else:
+            nchunks = -(-len(positions) // self.chunksize)  # ceiling division
+        nchunks = max(1, min(nchunks, len(positions)))
+        return array_split(positions, nchunks)
+
+    def start(self):
+        """
+        Function to start the worker pool, it is called automatically by the first evaluation.
+        """
+        # the executors are imported here, as loading multiprocessing slows down the import of the swarm
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        if self.backend == "process":
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+
+    def close(self):
+        """
+        Function to shut the worker pool down, a later evaluation starts a new one.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
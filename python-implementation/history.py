@@ -0,0 +1,131 @@
+import json
+import os
+
+from numpy import dtype, empty, float64, int64, memmap
+
+from reporter import Reporter
+
+# scalar columns of a history, in the order they are stored
+COLUMNS = (("iteration", int64), ("evaluations", int64), ("elapsed", float64), ("best", float64),
+           ("mean", float64), ("worst", float64), ("diversity", float64))
+
+
+class HistoryRecorder(Reporter):
+    """
+    This class streams the convergence history of a run to disk, so that long runs don't keep it in memory.
+
+    It is a reporter: attach it to the swarm through the reporters parameter. Every every iterations it records the
+    iteration, evaluation count, elapsed time, best, mean and worst fitness and diversity of the swarm, and optionally
+    the gbest vector. The history is a directory with one append-only binary file per column plus a small JSON file
+    describing them; records are buffered and written in batches, and can be read back lazily with History.
+
+    """
+
+    def __init__(self, path, every=1, gbest=False, batch=1024, append=False):
+        """
+        :param path: directory of the history, created if needed
+        :param every: record every this many iterations, to downsample long runs
+        :param gbest: if True, also record the gbest vector, dimension floats per record
+        :param batch: number of records buffered in memory between two writes
+        :param append: if True, add to the records already in path, e.g. when a run is resumed from a checkpoint;
+                       else the history in path is replaced by the first run recorded
+        """
+        self.path = path
+        self.every = every
+        self.gbest = gbest
+        self.batch = batch
+        self.append = append
+        self.files = None
+        self.buffers = None
+        self.count = 0  # number of records in the buffers
+
+    def start(self, swarm):
+        os.makedirs(self.path, exist_ok=True)
+        columns = list(COLUMNS) + ([("gbest", float64)] if self.gbest else [])
+        with open(os.path.join(self.path, "history.json"), "w") as description:
+            json.dump({"columns": [(name, dtype(kind).str) for name, kind in columns],
+                       "dimension": swarm.dimension}, description)
+
+        mode = "ab" if self.append else "wb"
+        self.append = True  # later runs of the same recorder continue the history
+        self.files = {name: open(os.path.join(self.path, name + ".bin"), mode) for name, _ in columns}
+        self.buffers = {name: empty(self.batch, dtype=kind) for name, kind in COLUMNS}
+        if self.gbest:
+            self.buffers["gbest"] = empty((self.batch, swarm.dimension))
+        self.count = 0
+
+    def report(self, statistics):
+        buffers, i = self.buffers, self.count
+        buffers["iteration"][i] = statistics.iteration
+        buffers["evaluations"][i] = statistics.evaluations
+        buffers["elapsed"][i] = statistics.elapsed
+        buffers["best"][i] = statistics.bestFitness
+        buffers["mean"][i] = statistics.meanFitness
+        buffers["worst"][i] = statistics.worstFitness
+        buffers["diversity"][i] = statistics.diversity
+        if self.gbest:
+            buffers["gbest"][i] = statistics.gbest
+        self.count += 1
+        if self.count == self.batch:
+            self.flush()
+
+    def finish(self, statistics):
+        if statistics.iteration % self.every:
+            self.report(statistics)
+        self.flush()
+        for historyFile in self.files.values():
+            historyFile.close()
+        self.files = None
+
+    def flush(self):
+        """
+        Function to write the buffered records to the column files.
+        """
+        for name, buffer in self.buffers.items():
+            buffer[:self.count].tofile(self.files[name])
+            self.files[name].flush()
+        self.count = 0
+
+
+class History:
+    """
+    This class reads a history written by HistoryRecorder.
+
+    Columns are memory-mapped on first access, so opening a history of millions of records is instantaneous, and only
+    the parts of a column that are actually used (e.g. every 1000th record for a plot) are read from disk.
+
+    """
+
+    def __init__(self, path):
+        """
+        :param path: directory of the history
+        """
+        self.path = path
+        with open(os.path.join(path, "history.json")) as description:
+            description = json.load(description)
+        self.columns = dict(description["columns"])
+        self.dimension = description["dimension"]
+        self.mapped = {}
+
+    def __getitem__(self, name):
+        """
+        Function to get a column of the history.
+
+        :param name: one of iteration, evaluations, elapsed, best, mean, worst, diversity, and gbest if it was recorded
+        :return: read-only memory-mapped array, (records,) or (records, dimension) for gbest
+        """
+        if name not in self.mapped:
+            if name not in self.columns:
+                raise KeyError(name)
+            filename = os.path.join(self.path, name + ".bin")
+            kind = dtype(self.columns[name])
+            width = self.dimension if name == "gbest" else 1
+            records = os.path.getsize(filename) // (kind.itemsize * width)
+            if records == 0:
+                return empty((0, width) if name == "gbest" else 0, dtype=kind)
+            shape = (records, width) if name == "gbest" else (records,)
+            self.mapped[name] = memmap(filename, dtype=kind, mode="r", shape=shape)
+        return self.mapped[name]
+
+    def __len__(self):
+        return len(self["iteration"])
@@ -0,0 +1,331 @@
+import math
+import multiprocessing
+import os
+import queue
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+from numpy import concatenate
+
+from seeding import *
+from swarm import Swarm
+
+
+class Transport:
+    """
+    This class is the base of the transports that carry migrants between the islands of an IslandModel.
+
+    A transport is set up in the driver process by open(), which returns one endpoint per island. The endpoints are
+    handed to the island processes, where start() is called before the first message and close() after the last one.
+    Messages are small tuples of numbers and NumPy arrays, sent with send() to the index of an island and taken one at
+    a time, in arrival order, from the inbox of the island with receive().
+
+    """
+
+    def open(self, islands):
+        """
+        Function to set up the transport for a run.
+
+        :param islands: number of islands
+        :return: list of islands endpoints, which must be picklable
+        """
+        raise NotImplementedError
+
+
+class PipeTransport(Transport):
+    """
+    Local transport: every island has an inbox that is a multiprocessing.Queue, i.e. a pipe fed by a background
+    thread, so sending never blocks the island.
+
+    """
+
+    def open(self, islands):
+        inboxes = [multiprocessing.Queue() for _ in range(islands)]
+        return [PipeEndpoint(index, inboxes) for index in range(islands)]
+
+
+class PipeEndpoint:
+    """
+    Endpoint of an island on a PipeTransport.
+
+    """
+
+    def __init__(self, index, inboxes):
+        self.index = index
+        self.inboxes = inboxes
+
+    def start(self):
+        pass
+
+    def send(self, destination, message):
+        self.inboxes[destination].put(message)
+
+    def receive(self):
+        return self.inboxes[self.index].get()
+
+    def close(self):
+        pass
+
+
+class SocketTransport(Transport):
+    """
+    Transport over TCP sockets, a local stand-in for a run spread over several machines: every island listens on an
+    address of its own, and opens one connection to each of its destinations on its first message, which is reused
+    for the rest of the run. Background threads of the island accept the connections and fill its inbox with what
+    they receive, so sending never waits for the destination to be receiving.
+
+    """
+
+    def __init__(self, addresses=None, host="localhost", timeout=30.0):
+        """
+        :param addresses: list of (host, port) addresses the islands listen on, one per island; by default free
+                          ports on host
+        :param host: host the islands listen on when no addresses are given
+        :param timeout: seconds a sender keeps retrying to connect to an island that isn't listening yet
+        """
+        self.addresses = addresses
+        self.host = host
+        self.timeout = timeout
+
+    def open(self, islands):
+        addresses = self.addresses
+        if addresses is None:
+            addresses = [(self.host, freePort(self.host)) for _ in range(islands)]
+        if len(addresses) != islands:
+            raise Exception(len(addresses), "is not a valid number of addresses, one per island is needed")
+        authkey = os.urandom(16)
+        return [SocketEndpoint(index, addresses, authkey, self.timeout) for index in range(islands)]
+
+
+class SocketEndpoint:
+    """
+    Endpoint of an island on a SocketTransport.
+
+    """
+
+    def __init__(self, index, addresses, authkey, timeout):
+        self.index = index
+        self.addresses = addresses
+        self.authkey = authkey
+        self.timeout = timeout
+        self.listener = None
+        self.inbox = None
+        self.connections = {}
+
+    def start(self):
+        self.inbox = queue.Queue()
+        self.listener = Listener(tuple(self.addresses[self.index]), authkey=self.authkey)
+        threading.Thread(target=self.accept, daemon=True).start()
+
+    def accept(self):
+        while True:
+            try:
+                connection = self.listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.read, args=(connection,), daemon=True).start()
+
+    def read(self, connection):
+        with connection:
+            while True:
+                try:
+                    self.inbox.put(connection.recv())
+                except (EOFError, OSError):
+                    return
+
+    def send(self, destination, message):
+        if destination not in self.connections:
+            deadline = time.monotonic() + self.timeout
+            while True:
+                try:
+                    self.connections[destination] = Client(tuple(self.addresses[destination]), authkey=self.authkey)
+                    break
+                except ConnectionRefusedError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.01)
+        self.connections[destination].send(message)
+
+    def receive(self):
+        return self.inbox.get()
+
+    def close(self):
+        for connection in self.connections.values():
+            connection.close()
+        if self.listener is not None:
+            self.listener.close()
+
+
+def freePort(host):
+    """
+    Function to find a TCP port that is free on the given host.
+
+    :param host: host name or address
+    :return: port number
+    """
+    with socket.socket() as probe:
+        probe.bind((host, 0))
+        return probe.getsockname()[1]
+
+
+def migrationTargets(migration, islands):
+    """
+    Function to turn the migration topology of an IslandModel into the destinations of every island.
+
+    :param migration: "ring" (every island sends to the next one), "all" (every island sends to every other one) or a
+                      list with, for every island, the list of islands it sends to
+    :param islands: number of islands
+    :return: list with the list of destinations of every island
+    """
+    if migration == "ring":
+        return [[(index + 1) % islands] if islands > 1 else [] for index in range(islands)]
+    if migration == "all":
+        return [[other for other in range(islands) if other != index] for index in range(islands)]
+    if isinstance(migration, str) or len(migration) != islands:
+        raise Exception(migration, "is not a valid parameter, accepted parameters: 'ring', 'all' or a list of "
+                                   "destinations per island")
+    return [list(destinations) for destinations in migration]
+
+
+def runIsland(index, parameters, seed, interval, migrants, destinations, sources, endpoint, results):
+    """
+    Function run by the process of an island: it optimizes its swarm in epochs of interval iterations, and after each
+    epoch but the last one sends its best particles to its destinations and waits for the migrants of its sources.
+
+    Every island goes through the same number of epochs, so the exchanges stay in step. An island whose stopping
+    criteria end its run keeps taking part in the exchanges, without iterating any more.
+    """
+    endpoint.start()
+    try:
+        swarm = Swarm(seed=seed, **parameters)
+        maxiterations = swarm.maxiterations
+        epochs = math.ceil(maxiterations / interval)
+        inbox = {}
+        stopped = False
+        for epoch in range(1, epochs + 1):
+            if not stopped:
+                swarm.optimize(min(epoch * interval, maxiterations) - swarm.iteration)
+                stopped = swarm.stopReason is not None
+            if epoch == epochs:
+                break
+            positions, fitness = swarm.emigrants(migrants)
+            for destination in destinations:
+                endpoint.send(destination, (epoch, index, positions, fitness))
+            # a fast source may already be an epoch ahead, its migrants are kept for later
+            while len(inbox.get(epoch, ())) < sources:
+                arrivalEpoch, source, sourcePositions, sourceFitness = endpoint.receive()
+                inbox.setdefault(arrivalEpoch, []).append((source, sourcePositions, sourceFitness))
+            arrivals = sorted(inbox.pop(epoch, []), key=lambda arrival: arrival[0])
+            if arrivals:
+                swarm.immigrate(concatenate([arrival[1] for arrival in arrivals]),
+                                concatenate([arrival[2] for arrival in arrivals]))
+        swarm.close()
+        results.put((index, swarm.gbest, swarm.gbestFitness, swarm.evaluations, swarm.allGbests))
+    finally:
+        endpoint.close()
+
+
+class IslandModel:
+    """
+    This class runs several independent swarms (islands) in separate processes, which exchange their best particles
+    every few iterations.
+
+    Each island is a complete Swarm that evaluates its own population, so the only communication is the migration,
+    a few particles every migrationInterval iterations, and a run scales over the cores with no cost per evaluation.
+    After every epoch of migrationInterval iterations, each island sends copies of its migrants best pbests to the
+    islands the migration topology points it to, and its worst particles are replaced by the migrants it receives.
+
+    The migrants travel over a pluggable Transport: pipes between local processes (PipeTransport, the default), or
+    TCP sockets (SocketTransport), a stand-in for islands on several machines.
+
+    The objective, and every parameter of the swarms, is pickled to the island processes, so the objective must be
+    picklable, e.g. a module level function or a ScalarObjective wrapping one.
+
+    """
+
+    def __init__(self, islands, migrationInterval=10, migrants=1, migration="ring", transport=None, seed=None,
+                 **parameters):
+        """
+        Function to store the configuration of the island model.
+
+        :param islands: number of islands, i.e. of swarms and processes
+        :param migrationInterval: number of iterations between two migrations
+        :param migrants: number of particles each island sends to each of its destinations
+        :param migration: migration topology, "ring", "all" or a list of destinations per island (see
+                          migrationTargets)
+        :param transport: Transport carrying the migrants, defaults to a PipeTransport
+        :param seed: seed of the run, every island gets an independent stream spawned from it
+        :param parameters: keyword parameters of the Swarm of every island (population_size, dimension,
+                           maxiterations, bounds, w, c1, c2, mode, objective, ...); population_size is per island. The
+                           stopping criteria default to none, so that every island runs maxiterations iterations
+        """
+        if islands < 1:
+            raise Exception(islands, "is not a valid parameter, the number of islands must be at least 1")
+        if migrationInterval < 1:
+            raise Exception(migrationInterval, "is not a valid parameter, the migration interval must be at least 1")
+        self.islands = islands
+        self.migrationInterval = migrationInterval
+        self.migrants = migrants
+        self.destinations = migrationTargets(migration, islands)
+        self.transport = transport if transport is not None else PipeTransport()
+        self.seed = seed
+        parameters.setdefault("stopping", [])
+        self.parameters = parameters
+        self.mode = parameters.get("mode", "min")
+
+        self.gbest = None
+        self.gbestFitness = None
+        self.islandBests = []
+        self.histories = []
+        self.evaluations = 0
+        self.elapsed = 0.0
+        self.evaluationsPerSecond = 0.0
+
+    def optimize(self):
+        """
+        This function starts one process per island, waits for all of them to finish, and keeps the best of their
+        gbests.
+
+        :return: gbest - the best solution found by the islands
+        """
+        start = time.perf_counter()
+        endpoints = self.transport.open(self.islands)
+        sources = [0] * self.islands
+        for destinations in self.destinations:
+            for destination in destinations:
+                sources[destination] += 1
+        results = multiprocessing.Queue()
+        seeds = spawnGenerators(self.seed, self.islands)
+        processes = [multiprocessing.Process(target=runIsland, args=(
+            index, self.parameters, seeds[index], self.migrationInterval, self.migrants, self.destinations[index],
+            sources[index], endpoints[index], results)) for index in range(self.islands)]
+        for process in processes:
+            process.start()
+
+        collected = {}
+        try:
+            while len(collected) < self.islands:
+                try:
+                    index, gbest, gbestFitness, evaluations, history = results.get(timeout=1.0)
+                except queue.Empty:
+                    for process in processes:
+                        if process.exitcode not in (None, 0):
+                            raise Exception(process.exitcode, "is the exit code of an island process, the run failed")
+                    continue
+                collected[index] = (gbest, gbestFitness, evaluations, history)
+        finally:
+            for process in processes:
+                if len(collected) < self.islands:
+                    process.terminate()
+                process.join()
+
+        self.islandBests = [collected[index][1] for index in range(self.islands)]
+        self.histories = [collected[index][3] for index in range(self.islands)]
+        self.evaluations = sum(collected[index][2] for index in range(self.islands))
+        best = (min if self.mode == "min" else max)(range(self.islands), key=lambda index: collected[index][1])
+        self.gbest, self.gbestFitness = collected[best][0], collected[best][1]
+        self.elapsed = time.perf_counter() - start
+        self.evaluationsPerSecond = self.evaluations / self.elapsed if self.elapsed > 0 else 0.0
+        return self.gbest
@@ -0,0 +1,330 @@
+from numpy import (absolute, arange, argmin, clip, concatenate, diag, dot, eye, finfo, float64, maximum, outer, sqrt,
+                   where)
+
+from stopping import EvaluationBudget
+
+
+class LocalSearch:
+    """
+    This class is the base of the local search methods used to refine gbest, see Refinement.
+
+    A method minimizes a batched objective from a starting position, within the bounds of the swarm and a budget of
+    evaluations. The positions of a step that can be known in advance (e.g. the polls of a pattern search or the
+    differences of a gradient) are evaluated together, as one batch. Subclasses implement search().
+
+    """
+
+    def search(self, position, fitness, evaluate, lower, upper, scale, budget):
+        """
+        Function to minimize the objective from a starting position.
+
+        :param position: (dimension,) float array, the starting position
+        :param fitness: fitness of the starting position
+        :param evaluate: batched objective to be minimized, called with (n, dimension) arrays of positions
+        :param lower: (dimension,) array of the lower bounds
+        :param upper: (dimension,) array of the upper bounds
+        :param scale: (dimension,) array of positive initial step sizes
+        :param budget: largest number of positions evaluated
+        :return: position, fitness, evaluations - the best position found, its fitness and the number of positions
+                 evaluated
+        """
+        raise NotImplementedError
+
+
+class PatternSearch(LocalSearch):
+    """
+    Compass pattern search: the 2 * dimension positions one step away along every variable are polled as one batch.
+    The search moves to the best of them if it improves on the current position, and then expands the step along that
+    variable, and otherwise all the steps are contracted, until they fall below tolerance times the width of the
+    bounds.
+
+    """
+
+    def __init__(self, expansion=2.0, contraction=0.5, tolerance=1e-12):
+        """
+        :param expansion: factor applied to the step of the variable moved along after a successful poll
+        :param contraction: factor applied to the steps after an unsuccessful poll
+        :param tolerance: smallest step, relative to the width of the bounds
+        """
+        self.expansion = expansion
+        self.contraction = contraction
+        self.tolerance = tolerance
+
+    def search(self, position, fitness, evaluate, lower, upper, scale, budget):
+        step, used = scale.copy(), 0
+        smallest = self.tolerance * (upper - lower)
+        dimension = len(position)
+        while used + 2 * dimension <= budget and (step > smallest).any():
+            polls = clip(position + concatenate((diag(step), -diag(step))), lower, upper)
+            values = evaluate(polls)
+            used += 2 * dimension
+            k = argmin(values)
+            if values[k] < fitness:
+                position, fitness = polls[k], values[k]
+                step[k % dimension] *= self.expansion
+            else:
+                step *= self.contraction
+        return position, fitness, used
+
+
+class NelderMead(LocalSearch):
+    """
+    Nelder-Mead simplex search, with the coefficients adapted to the dimension (Gao and Han, 2012) so that it keeps
+    making progress beyond a few variables. The initial simplex and the shrink steps are evaluated as one batch; the
+    reflections, expansions and contractions depend on each other and are evaluated one at a time. Every vertex is
+    clipped into the bounds. The search stops when the simplex is smaller than tolerance times the width of the bounds,
+    or when its vertices all have the same fitness.
+
+    """
+
+    def __init__(self, tolerance=1e-12):
+        """
+        :param tolerance: smallest size of the simplex, relative to the width of the bounds
+        """
+        self.tolerance = tolerance
+
+    def search(self, position, fitness, evaluate, lower, upper, scale, budget):
+        dimension = len(position)
+        if budget < dimension + 1:
+            return position, fitness, 0
+        reflection, expansion = 1.0, 1.0 + 2.0 / dimension
+        contraction, shrink = 0.75 - 0.5 / dimension, 1.0 - 1.0 / dimension
+        # step away from the starting position along every variable, inwards at the upper bounds
+        steps = where(position + scale > upper, -scale, scale)
+        simplex = concatenate((position[None, :], clip(position + diag(steps), lower, upper)))
+        values = concatenate(([fitness], evaluate(simplex[1:])))
+        used = dimension
+        smallest = self.tolerance * (upper - lower)
+
+        def point(x):
+            return evaluate(x[None, :])[0]
+
+        while used < budget:
+            order = values.argsort(kind="stable")
+            simplex, values = simplex[order], values[order]
+            if values[-1] == values[0] or (absolute(simplex[1:] - simplex[0]) <= smallest).all():
+                break
+            centroid = simplex[:-1].mean(axis=0)
+            reflected = clip(centroid + reflection * (centroid - simplex[-1]), lower, upper)
+            fr = point(reflected)
+            used += 1
+            if fr < values[0]:
+                if used < budget:
+                    expanded = clip(centroid + expansion * (reflected - centroid), lower, upper)
+                    fe = point(expanded)
+                    used += 1
+                    if fe < fr:
+                        reflected, fr = expanded, fe
+                simplex[-1], values[-1] = reflected, fr
+                continue
+            if fr < values[-2]:
+                simplex[-1], values[-1] = reflected, fr
+                continue
+            if used >= budget:
+                break
+            if fr < values[-1]:  # outside contraction
+                contracted = clip(centroid + contraction * (reflected - centroid), lower, upper)
+                fc = point(contracted)
+                accepted = fc <= fr
+            else:  # inside contraction
+                contracted = clip(centroid + contraction * (simplex[-1] - centroid), lower, upper)
+                fc = point(contracted)
+                accepted = fc < values[-1]
+            used += 1
+            if accepted:
+                simplex[-1], values[-1] = contracted, fc
+                continue
+            if used + dimension > budget:
+                break
+            simplex[1:] = simplex[0] + shrink * (simplex[1:] - simplex[0])
+            values[1:] = evaluate(simplex[1:])
+            used += dimension
+        best = argmin(values)
+        return simplex[best], values[best], used
+
+
+class QuasiNewton(LocalSearch):
+    """
+    BFGS quasi-Newton search on finite differences. The gradient is estimated with forward differences, the dimension
+    shifted positions evaluated as one batch (backward differences at the upper bounds). The step along the search
+    direction is chosen by a backtracking line search that evaluates trials step lengths 1, 1/2, 1/4, ... as one
+    batch, and takes the longest one with sufficient decrease (Armijo condition). The trial positions are clipped into
+    the bounds. The first direction is the steepest descent, scaled to the initial steps.
+
+    """
+
+    def __init__(self, trials=4, difference=None, tolerance=1e-12):
+        """
+        :param trials: number of step lengths evaluated per line search batch
+        :param difference: relative finite difference step, defaults to the square root of the machine epsilon
+        :param tolerance: smallest step, relative to the width of the bounds
+        """
+        self.trials = trials
+        self.difference = difference if difference is not None else sqrt(finfo(float).eps)
+        self.tolerance = tolerance
+
+    def gradient(self, position, fitness, evaluate, upper):
+        """
+        :return: forward (backward at the upper bounds) finite difference estimate of the gradient at position
+        """
+        h = self.difference * maximum(absolute(position), 1.0)
+        h = where(position + h > upper, -h, h)
+        return (evaluate(position + diag(h)) - fitness) / h
+
+    def search(self, position, fitness, evaluate, lower, upper, scale, budget):
+        dimension = len(position)
+        if budget < dimension + self.trials:
+            return position, fitness, 0
+        gradient = self.gradient(position, fitness, evaluate, upper)
+        used = dimension
+        inverse = eye(dimension) * (sqrt(dot(scale, scale)) / max(sqrt(dot(gradient, gradient)), 1e-300))
+        lengths = 0.5 ** arange(self.trials)
+        smallest = self.tolerance * (upper - lower)
+        while used + self.trials + dimension <= budget:
+            direction = -inverse @ gradient
+            if dot(direction, gradient) >= 0:  # not a descent direction, restart from the steepest descent
+                inverse = eye(dimension) * (sqrt(dot(scale, scale)) / max(sqrt(dot(gradient, gradient)), 1e-300))
+                direction = -inverse @ gradient
+            accepted = None
+            factor = 1.0
+            while used + self.trials + dimension <= budget:
+                trials = clip(position + (factor * lengths)[:, None] * direction, lower, upper)
+                values = evaluate(trials)
+                used += self.trials
+                decrease = values <= fitness + 1e-4 * (trials - position) @ gradient
+                if decrease.any():
+                    accepted = int(decrease.argmax())
+                    break
+                factor *= 0.5 ** self.trials
+                if (absolute(factor * direction) <= smallest).all():
+                    break
+            if accepted is None:
+                break
+            step = trials[accepted] - position
+            if (absolute(step) <= smallest).all():
+                break
+            position, fitness = trials[accepted], values[accepted]
+            previous, gradient = gradient, self.gradient(position, fitness, evaluate, upper)
+            used += dimension
+            change = gradient - previous
+            curvature = dot(change, step)
+            if curvature > 1e-12 * sqrt(dot(step, step) * dot(change, change)):
+                rho = 1.0 / curvature
+                left = eye(dimension) - rho * outer(step, change)
+                inverse = left @ inverse @ left.T + rho * outer(step, step)
+        return position, fitness, used
+
+
+# local search methods accepted by name by Refinement
+LOCAL_SEARCHES = {"nelder-mead": NelderMead, "pattern": PatternSearch, "quasi-newton": QuasiNewton}
+
+
+class Refinement:
+    """
+    This class is the hybrid local refinement of the swarm: from time to time, a local search is run from gbest, and
+    an improved position found by it becomes the pbest of the particle gbest belongs to, and so the new gbest. PSO
+    finds the basin of the optimum quickly but takes long to converge within it; a local method finishes that in a few
+    hundred evaluations.
+
+    A refinement is run every `every` iterations, and/or when the gbest fitness has not improved by more than tolerance
+    over the last window iterations (and no refinement was run in them), counted like Stagnation does. The refinement
+    runs in tell() before the stopping criteria, and its default window is half the one of the default Stagnation(50)
+    stop, so that a stagnating swarm is refined before it is stopped. The local search starts with steps equal to
+    the spread of the pbests around gbest along every variable, so that it adapts to how far the swarm has converged.
+    It is given at most `evaluations` positions per refinement, and `budget` positions over the whole run, and never
+    more than the swarm has left under its EvaluationBudget criteria; they are counted in swarm.evaluations.
+
+    """
+
+    def __init__(self, method="nelder-mead", every=None, window=25, tolerance=0.0, evaluations=None, budget=None):
+        """
+        :param method: LocalSearch, or the name of one: "nelder-mead", "pattern" or "quasi-newton"
+        :param every: number of iterations between two periodic refinements, None for none
+        :param window: number of iterations without improvement that trigger a refinement, None for none; it should
+                       be smaller than the window of a Stagnation stopping criterion of the swarm
+        :param tolerance: largest change of the gbest fitness over window that still counts as no improvement
+        :param evaluations: largest number of evaluations of one refinement, defaults to 100 times the dimension
+        :param budget: largest number of evaluations of all the refinements of the swarm, None for no limit
+        """
+        if isinstance(method, str):
+            if method not in LOCAL_SEARCHES:
+                raise Exception(method, "is not a valid parameter, accepted parameters: " + ", ".join(LOCAL_SEARCHES))
+            method = LOCAL_SEARCHES[method]()
+        self.method = method
+        self.every = every
+        self.window = window
+        self.tolerance = tolerance
+        self.evaluations = evaluations
+        self.budget = budget
+        self.used = 0  # evaluations used by the refinements so far
+        self.improvements = 0  # number of refinements that improved gbest
+        self.last = 0  # iteration of the last refinement
+
+    def due(self, swarm):
+        """
+        :return: True if a refinement should be run after the current iteration of the swarm
+        """
+        if self.every is not None and swarm.iteration % self.every == 0:
+            return True
+        # the current gbest fitness, not recorded yet, and the window - 1 recorded before it
+        if self.window is None or swarm.iteration - self.last < self.window or len(swarm.allGbests) < self.window - 1:
+            return False
+        return absolute(swarm.gbestFitness - swarm.allGbests[-(self.window - 1)]) <= self.tolerance
+
+    def update(self, swarm):
+        """
+        Function to run a refinement if one is due, see Refinement.
+
+        :param swarm: swarm being optimized, after the pbests of the iteration were updated
+        :return: True if gbest was improved
+        """
+        if not self.due(swarm):
+            return False
+        self.last = swarm.iteration
+        return self.refine(swarm)
+
+    def refine(self, swarm):
+        """
+        Function to run the local search from gbest, and to make the position found the pbest of the particle of gbest
+        if it is better. The search runs in float64; with another dtype, the position found is rounded to it and
+        evaluated again. The evaluations of a refinement are bounded by evaluations, by what is left of budget and by
+        what is left of every EvaluationBudget of the swarm.
+
+        :param swarm: swarm being optimized
+        :return: True if gbest was improved
+        """
+        budget = self.evaluations if self.evaluations is not None else 100 * swarm.dimension
+        if self.budget is not None:
+            budget = min(budget, self.budget - self.used)
+        # never beyond the evaluations the swarm has left, see EvaluationBudget
+        for criterion in swarm.stopping:
+            if isinstance(criterion, EvaluationBudget):
+                budget = min(budget, criterion.evaluations - swarm.evaluations)
+        rounded = swarm.dtype != float64
+        if rounded:
+            budget -= 1  # kept for the evaluation of the rounded position
+        if budget <= 0:
+            return False
+        sign = 1.0 if swarm.mode == "min" else -1.0
+        lower, upper = swarm.lower.astype(float), swarm.upper.astype(float)
+        gbest = swarm.gbest.astype(float)
+        spread = absolute(swarm.pbests - swarm.gbest).max(axis=0).astype(float)
+        scale = clip(spread, 1e-9 * (upper - lower), 0.25 * (upper - lower))
+        position, fitness, used = self.method.search(gbest, sign * swarm.gbestFitness,
+                                                     lambda positions: sign * swarm.evaluate(positions), lower, upper,
+                                                     scale, budget)
+        if rounded and used:
+            # the pbests are stored in the dtype of the swarm: the fitness must be the one of the rounded position
+            position = position.astype(swarm.dtype)
+            fitness = sign * swarm.evaluate(position[None, :])[0]
+            used += 1
+        self.used += used
+        swarm.evaluations += used
+        if not fitness < sign * swarm.gbestFitness:
+            return False
+        j = swarm.bestIndex
+        swarm.pbests[j] = position
+        swarm.pbestFitness[j] = sign * fitness
+        swarm.setGbest(j)
+        self.improvements += 1
+        return True
@@ -0,0 +1,158 @@
+from numpy import asarray, clip, copyto, empty_like, flatnonzero, inf, take
+
+from pareto import *
+from swarm import Swarm
+
+
+class MultiObjectiveSwarm(Swarm):
+    """
+    This class is a multi-objective particle swarm (MOPSO): the objective returns a vector of objectives for every
+    position, all of them minimized or maximized according to mode, and the swarm searches for the Pareto front instead
+    of a single best position.
+
+    The non-dominated positions found so far are kept in an external ParetoArchive of bounded size. In the velocity
+    update every particle is attracted to a leader drawn from the archive in every iteration, favouring its sparse
+    regions, instead of gbest. A pbest is replaced by the new position of its particle if the new position dominates
+    it, kept if it dominates the new position, and replaced with probability 1/2 when neither dominates the other.
+
+    Without help, the swarm tends to collapse onto a part of the front (e.g. the ends of a concave front). With
+    mutation, as in the MOPSO of Coello, Pulido and Lechuga, after every position update each particle is mutated with
+    probability p = (1 - iteration / maxiterations) ** (5 / mutation): one of its variables, drawn at random, is moved
+    uniformly within p times the width of its bounds. Mutation is strong at the start of the run and fades out.
+
+    gbest and gbestFitness are the point of the archive that is best along the first objective, so that reporters, the
+    convergence history and the stopping criteria still work on a single number; the front itself is in archive, which
+    optimize() returns. By default there are no stopping criteria, the run lasts maxiterations.
+
+    The cache, constraints, surrogate screening, local refinement, checkpoints, neighbourhood topologies and the
+    asynchronous mode are not supported.
+
+    """
+
+    def __init__(self, population_size, dimension, maxiterations, bounds, w, c1, c2, mode, objectives, archive=None,
+                 mutation=0.5, **options):
+        """
+        Function to initialize the swarm, and its archive with the non-dominated initial positions.
+
+        :param objectives: number of objectives, the objective returns an (n, objectives) array for n positions
+        :param archive: ParetoArchive with the mode of the swarm, defaults to 200 points pruned by crowding distance
+        :param mutation: mutation rate, larger for more mutation, 0 to disable it
+        :param options: other parameters of Swarm, e.g. objective, workers, boundary, stopping, reporters, seed, vmax
+        """
+        for name in ("cache", "constraints", "screening", "refinement", "checkpoint", "topology"):
+            if options.get(name) is not None:
+                raise Exception(name, "is not supported by the multi-objective swarm")
+        if archive is not None and archive.mode != mode:
+            raise Exception(archive.mode, "is not a valid parameter, the archive must have the mode of the swarm")
+        self.objectives = objectives
+        self.mutation = mutation
+        self.archive = archive if archive is not None else ParetoArchive(mode=mode)
+        self.social = None  # work array of the leaders, allocated on the first velocity update
+        options.setdefault("stopping", [])
+        super().__init__(population_size, dimension, maxiterations, bounds, w, c1, c2, mode, **options)
+        if not self.evaluated:
+            # the fitness of the initial population is given to the first tell(), one row of objectives per particle
+            self.pbestFitness = self.pbestFitness[:, None].repeat(objectives, axis=1)
+            self.fitnesses = self.pbestFitness.copy()
+
+    def configure(self, **parameters):
+        """
+        Function to validate and store the parameters of the swarm, see Swarm.configure. The archive draws its random
+        numbers from the generator of the swarm.
+        """
+        super().configure(**parameters)
+        self.archive.rng = self.rng
+
+    def optimize(self, iterations=None):
+        """
+        This function will start the optimization process, see Swarm.optimize.
+
+        :param iterations: if given, stop after at most this many iterations
+        :return: archive - the ParetoArchive of the non-dominated positions found
+        """
+        super().optimize(iterations)
+        return self.archive
+
+    def optimizeAsync(self):
+        raise Exception(self, "can't be run in the asynchronous mode, use optimize()")
+
+    def evaluate(self, positions):
+        """
+        Function to evaluate the objective on a batch of positions.
+
+        :param positions: (n, dimension) array of positions whose fitness is to be evaluated
+        :return: (n, objectives) float array
+        """
+        return asarray(self.objective(positions), dtype=float).reshape(len(positions), self.objectives)
+
+    def socialBests(self):
+        """
+        Function to draw a leader from the archive for every particle, see ParetoArchive.leaders.
+
+        :return: (population_size, dimension) array of the leaders
+        """
+        if self.social is None:
+            self.social = empty_like(self.pbests)
+        return take(self.archive.positions, self.archive.leaders(self.population_size), axis=0, out=self.social)
+
+    def updatePosition(self):
+        """
+        Function to update the position of every particle, see Swarm.updatePosition, and then to mutate some of them,
+        see MultiObjectiveSwarm.
+        """
+        super().updatePosition()
+        if self.mutation <= 0:
+            return
+        probability = (1 - self.iteration / self.maxiterations) ** (5 / self.mutation)
+        rows = flatnonzero(self.rng.random(self.population_size) < probability)
+        if len(rows):
+            variables = self.rng.integers(self.dimension, size=len(rows))
+            lower, upper = self.lower[variables], self.upper[variables]
+            steps = self.rng.uniform(-1, 1, len(rows)) * probability * (upper - lower)
+            self.positions[rows, variables] = clip(self.positions[rows, variables] + steps, lower, upper)
+
+    def updatePbest(self, currentFitness, currentViolations=None):
+        """
+        This function takes the objectives of every particle at its current position, replaces the pbests by Pareto
+        dominance (see MultiObjectiveSwarm), and offers the current positions to the archive.
+
+        :param currentFitness: (population_size, objectives) array of the objectives of the current positions
+        :param currentViolations: not used, the multi-objective swarm has no constraints
+        """
+        copyto(self.fitnesses, currentFitness)
+        current, pbest = currentFitness, self.pbestFitness
+        if self.mode != "min":
+            current, pbest = -current, -pbest
+        improved = dominates(current, pbest) | (~dominates(pbest, current) & (self.rng.random(len(current)) < 0.5))
+        copyto(self.improved, improved)
+        copyto(self.pbests, self.positions, where=improved[:, None])
+        copyto(self.pbestFitness, currentFitness, where=improved[:, None])
+        if self.archive.insert(self.positions, currentFitness):
+            self.setGbest(self.archive.extreme())
+
+    def updateGbest(self):
+        """
+        This function offers all the pbests to the archive and takes gbest from it. Before the initial population is
+        evaluated, gbest is the first particle, with the worst possible fitness.
+
+        :return: gbest
+        """
+        if self.evaluated:
+            self.archive.insert(self.pbests, self.pbestFitness)
+        if len(self.archive):
+            self.setGbest(self.archive.extreme())
+        else:
+            self.bestIndex, self.gbest = 0, self.pbests[0].copy()
+            self.gbestFitness, self.gbestViolation = inf if self.mode == "min" else -inf, 0.0
+        return self.gbest
+
+    def setGbest(self, j):
+        """
+        Function to make point j of the archive the gbest.
+
+        :param j: index into the archive
+        """
+        self.bestIndex = j
+        self.gbest = self.archive.positions[j].copy()
+        self.gbestFitness = float(self.archive.fitness[j, 0])
+        self.gbestViolation = 0.0
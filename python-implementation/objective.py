@@ -0,0 +1,34 @@
+from numpy import array
+
+
+class ScalarObjective:
+    """
+    This class adapts a fitness function that scores one position at a time to the batched objective interface used by
+    the swarm.
+
+    A batched objective is any callable that takes an (n, dimension) array of positions and returns n fitness values.
+    Objectives that can be written with array operations should implement that interface directly, since the swarm
+    then evaluates the whole population with a single call; this adapter exists for functions that can't, e.g. ones
+    built on math.sin or on an external simulation.
+
+    Instances are plain picklable objects (as long as the wrapped function is picklable), so they can be sent to worker
+    processes.
+
+    """
+
+    def __init__(self, function):
+        """
+        Function to store the scalar fitness function to be wrapped.
+
+        :param function: callable taking a single position vector and returning its fitness as a number
+        """
+        self.function = function
+
+    def __call__(self, positions):
+        """
+        Function to evaluate the wrapped fitness function on every row of positions.
+
+        :param positions: (n, dimension) array of positions whose fitness is to be evaluated
+        :return: array of n fitness values
+        """
+        return array([self.function(position) for position in positions], dtype=float)
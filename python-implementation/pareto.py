@@ -0,0 +1,272 @@
+from numpy import (arange, argmax, argmin, argpartition, argsort, asarray, concatenate, empty, flatnonzero, floor, inf,
+                   lexsort, minimum, ones, unique, where, zeros)
+
+from seeding import makeGenerator
+
+# ways of pruning the archive when it is full, see ParetoArchive
+PRUNING = ("crowding", "grid")
+
+
+def dominates(a, b):
+    """
+    Function to test Pareto dominance between two arrays of objective vectors, row by row, for minimization: a
+    dominates b if it is no worse in every objective and better in at least one.
+
+    :param a: (n, objectives) array
+    :param b: (n, objectives) array
+    :return: boolean array of n values, True where the row of a dominates the row of b
+    """
+    return (a <= b).all(axis=-1) & (a < b).any(axis=-1)
+
+
+def covered(points, front, presorted=False, chunk=1 << 22):
+    """
+    Function to find which points are weakly dominated (dominated or equalled) by at least one row of front, for
+    minimization.
+
+    With two objectives, front is sorted by the first objective and every point is located in it with a binary search:
+    it is covered if the smallest second objective among the rows whose first objective is not larger is not larger
+    than its own. With more objectives, the points are compared with every row of front, in blocks of at most chunk
+    pairs so that memory stays bounded.
+
+    :param points: (n, objectives) array
+    :param front: (m, objectives) array
+    :param presorted: True if front is already a two-objective non-dominated front sorted by the first objective, so
+                      that its second objective is decreasing
+    :param chunk: largest number of pairs of points compared at once
+    :return: boolean array of n values
+    """
+    if len(front) == 0:
+        return zeros(len(points), dtype=bool)
+    if points.shape[1] == 2:
+        if presorted:
+            first, smallest = front[:, 0], front[:, 1]
+        else:
+            order = lexsort((front[:, 1], front[:, 0]))
+            first, smallest = front[order, 0], minimum.accumulate(front[order, 1])
+        index = first.searchsorted(points[:, 0], side="right") - 1
+        return (index >= 0) & (smallest[index.clip(0)] <= points[:, 1])
+    result = empty(len(points), dtype=bool)
+    block = max(1, chunk // len(front))
+    for start in range(0, len(points), block):
+        stop = min(start + block, len(points))
+        result[start:stop] = noWorse(front, points[start:stop]).any(axis=1)
+    return result
+
+
+def noWorse(front, points):
+    """
+    Function to compare every point with every row of front, one objective at a time so that every operation runs over
+    a whole (points, rows) block.
+
+    :return: (len(points), len(front)) boolean array, True where the row of front is no worse than the point in every
+             objective
+    """
+    result = front[None, :, 0] <= points[:, None, 0]
+    for objective in range(1, points.shape[1]):
+        result &= front[None, :, objective] <= points[:, None, objective]
+    return result
+
+
+def nondominated(points, chunk=1 << 22):
+    """
+    Function to find the non-dominated points of a set, for minimization. Of several equal points, only the first one
+    is kept.
+
+    With two objectives the points are sorted by the first objective (then the second), and a point is kept if its
+    second objective is smaller than that of every point before it. With more objectives the points are compared
+    pairwise, in blocks of at most chunk pairs.
+
+    :param points: (n, objectives) array
+    :param chunk: largest number of pairs of points compared at once
+    :return: boolean array of n values, True for the points that are kept
+    """
+    n = len(points)
+    if n == 0 or points.shape[1] == 2:
+        keep = zeros(n, dtype=bool)
+        if n:
+            order = lexsort((points[:, 1], points[:, 0]))
+            second = points[order, 1]
+            before = concatenate(([inf], minimum.accumulate(second)[:-1]))
+            keep[order] = second < before
+        return keep
+    keep = empty(n, dtype=bool)
+    block = max(1, chunk // n)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        dominated = noWorse(points, points[start:stop])
+        # a row no worse than a point dominates it, unless they are equal: then only the first of them is kept
+        equal = points[None, :, 0] == points[start:stop, None, 0]
+        for objective in range(1, points.shape[1]):
+            equal &= points[None, :, objective] == points[start:stop, None, objective]
+        dominated &= ~equal | (arange(n)[None, :] < arange(start, stop)[:, None])
+        keep[start:stop] = ~dominated.any(axis=1)
+    return keep
+
+
+def crowdingDistance(points):
+    """
+    Function to compute the crowding distance of every point of a front (as in NSGA-II): the sum over the objectives of
+    the gap between its two neighbours along that objective, normalized by the range of the objective. The extreme
+    points of every objective get an infinite distance.
+
+    :param points: (n, objectives) array
+    :return: float array of n distances, larger for more isolated points
+    """
+    n, objectives = points.shape
+    distance = zeros(n)
+    if n < 3:
+        distance[:] = inf
+        return distance
+    for objective in range(objectives):
+        order = argsort(points[:, objective], kind="stable")
+        values = points[order, objective]
+        width = values[-1] - values[0]
+        distance[order[0]] = distance[order[-1]] = inf
+        if width > 0:
+            distance[order[1:-1]] += (values[2:] - values[:-2]) / width
+    return distance
+
+
+class ParetoArchive:
+    """
+    This class is the external archive of a multi-objective swarm: the non-dominated positions found so far, with their
+    objective vectors, bounded to capacity points.
+
+    The archive is kept as arrays: positions (m, dimension) and fitness (m, objectives), and a minimization view of the
+    fitness, keys, which is the fitness itself in "min" mode and its negation in "max" mode. A batch of candidates is
+    inserted at once: it is reduced to its own non-dominated points, the ones covered by the archive are dropped, and so
+    are the members of the archive dominated by the remaining ones, see nondominated and covered. With two objectives
+    the archive is kept sorted by the first objective, so that these checks are binary searches; with more, they are
+    blocked array comparisons.
+
+    When the archive grows beyond capacity it is pruned: "crowding" drops the points with the smallest crowding
+    distance, "grid" divides the range of every objective into divisions and drops points from the most crowded
+    hypercubes. The same density is used to draw leaders for the particles: a binary tournament on the crowding
+    distance, or a roulette wheel favouring sparse hypercubes.
+
+    """
+
+    def __init__(self, capacity=200, mode="min", pruning="crowding", divisions=10, seed=None):
+        """
+        :param capacity: largest number of points kept
+        :param mode: "min" or "max", whether every objective is minimized or maximized
+        :param pruning: "crowding" or "grid"
+        :param divisions: number of divisions of every objective for "grid"
+        :param seed: seed of the random numbers of the pruning and of the leaders, see makeGenerator; a swarm replaces
+                     the generator by its own
+        """
+        if mode not in ("min", "max"):
+            raise Exception(mode, "is not a valid parameter, accepted parameters: 'min' or 'max'")
+        if pruning not in PRUNING:
+            raise Exception(pruning, "is not a valid parameter, accepted parameters: " + ", ".join(PRUNING))
+        self.capacity = capacity
+        self.mode = mode
+        self.pruning = pruning
+        self.divisions = divisions
+        self.rng = makeGenerator(seed)
+        self.positions = None
+        self.fitness = None
+        self.keys = None
+        self.density = None  # crowding distance of every point, or number of points in its hypercube
+        self.cells = self.counts = None  # hypercube of every point and number of points per hypercube, for "grid"
+        self.insertions = 0  # number of candidates that entered the archive so far
+
+    def __len__(self):
+        return 0 if self.keys is None else len(self.keys)
+
+    def insert(self, positions, fitness):
+        """
+        Function to offer a batch of candidates to the archive.
+
+        :param positions: (n, dimension) array of positions
+        :param fitness: (n, objectives) array of their objective vectors
+        :return: number of candidates that entered the archive
+        """
+        fitness = asarray(fitness, dtype=float)
+        keys = fitness if self.mode == "min" else -fitness
+        keep = nondominated(keys)
+        if self.keys is not None:
+            keep[keep] = ~covered(keys[keep], self.keys, presorted=keys.shape[1] == 2)
+        count = int(keep.sum())
+        if count == 0:
+            return 0
+        if self.keys is None:
+            self.positions, self.fitness, self.keys = positions[keep], fitness[keep], keys[keep]
+        else:
+            survivors = ~covered(self.keys, keys[keep])
+            self.positions = concatenate((self.positions[survivors], positions[keep]))
+            self.fitness = concatenate((self.fitness[survivors], fitness[keep]))
+            self.keys = concatenate((self.keys[survivors], keys[keep]))
+        if self.keys.shape[1] == 2:
+            self.select(argsort(self.keys[:, 0], kind="stable"))
+        self.updateDensity()
+        if len(self) > self.capacity:
+            self.prune(len(self) - self.capacity)
+        self.insertions += count
+        return count
+
+    def select(self, rows):
+        """
+        Function to keep the given rows of the archive, in that order.
+
+        :param rows: indices or boolean mask of the points to keep
+        """
+        self.positions, self.fitness, self.keys = self.positions[rows], self.fitness[rows], self.keys[rows]
+
+    def updateDensity(self):
+        """
+        Function to recompute the density of the points of the archive, see ParetoArchive.
+        """
+        if self.pruning == "crowding":
+            self.density = crowdingDistance(self.keys)
+            return
+        lower, upper = self.keys.min(axis=0), self.keys.max(axis=0)
+        width = upper - lower
+        width[width == 0] = 1.0
+        cells = floor((self.keys - lower) / width * self.divisions).clip(0, self.divisions - 1)
+        _, cells, self.counts = unique(cells, axis=0, return_inverse=True, return_counts=True)
+        self.cells = cells.reshape(-1)
+        self.density = self.counts[self.cells]
+
+    def prune(self, excess):
+        """
+        Function to drop excess points from the archive, the most crowded ones, see ParetoArchive.
+
+        :param excess: number of points to drop
+        """
+        if self.pruning == "crowding":
+            keep = argpartition(-self.density, self.capacity - 1)[:len(self) - excess]
+        else:
+            # remove points one at a time from the currently most crowded hypercube, at random within it
+            counts = self.counts.copy()
+            alive = ones(len(self), dtype=bool)
+            for _ in range(excess):
+                cell = argmax(counts)
+                members = flatnonzero(alive & (self.cells == cell))
+                alive[members[self.rng.integers(len(members))]] = False
+                counts[cell] -= 1
+            keep = flatnonzero(alive)
+        keep.sort()
+        self.select(keep)
+        self.updateDensity()
+
+    def leaders(self, count):
+        """
+        Function to draw leaders from the archive, favouring its sparse regions.
+
+        :param count: number of leaders
+        :return: integer array of count indices into the archive
+        """
+        size = len(self)
+        if self.pruning == "crowding":
+            first, second = self.rng.integers(size, size=(2, count))
+            return where(self.density[first] >= self.density[second], first, second)
+        weights = 1.0 / self.density.astype(float) ** 2  # hypercube drawn by 1 / count, then a point within it
+        return self.rng.choice(size, size=count, p=weights / weights.sum())
+
+    def extreme(self, objective=0):
+        """
+        :return: index of the point of the archive that is best along the given objective
+        """
+        return int(argmin(self.keys[:, objective]))
@@ -0,0 +1,54 @@
+"""
+Plotting helpers for the swarm.
+
+This module is optional: it is the only one that needs matplotlib, and matplotlib is only imported when a plot is
+actually drawn, so neither importing the swarm nor importing this module loads it.
+"""
+
+
+def plotConvergenceGraph(fitnesses, top=100, show=True):
+    """
+    Function to plot the change in fitness of best particle over iterations
+
+    :param fitnesses: sequence of gbest fitnesses, one per iteration, e.g. Swarm.allGbests
+    :param top: upper limit of the fitness axis, None to fit the data
+    :param show: if True, show the plot window, else just draw on the current figure
+    :return: the matplotlib axes the graph was drawn on
+    """
+    import matplotlib.pyplot as plt
+
+    if top is not None:
+        plt.ylim(top=top)
+    plt.plot(list(range(len(fitnesses))), fitnesses)
+    plt.xlabel('Generations')
+    plt.ylabel('Fitness')
+    if show:
+        plt.show()
+    return plt.gca()
+
+
+def plotHistory(history, column="best", maxPoints=10000, show=True):
+    """
+    Function to plot a column of a history recorded by HistoryRecorder against the iterations.
+
+    The history is read lazily: at most maxPoints evenly spaced records are read from disk, so histories of millions
+    of iterations plot as fast as short ones.
+
+    :param history: History, or path of the history directory
+    :param column: name of the column to plot, e.g. best, mean, worst or diversity
+    :param maxPoints: largest number of records plotted
+    :param show: if True, show the plot window, else just draw on the current figure
+    :return: the matplotlib axes the graph was drawn on
+    """
+    import matplotlib.pyplot as plt
+    from history import History
+
+    if not isinstance(history, History):
+        history = History(history)
+    step = max(1, -(-len(history) // maxPoints))  # ceiling division
+    plt.plot(history["iteration"][::step], history[column][::step])
+    plt.xlabel('Generations')
+    plt.ylabel(column.capitalize())
+    if show:
+        plt.show()
+    return plt.gca()
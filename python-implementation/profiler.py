@@ -0,0 +1,201 @@
+import json
+import os
+import sys
+import time
+
+from numpy import count_nonzero
+
+from boundary import BOUNDARY_STRATEGIES
+from reporter import Reporter
+
+# methods of the swarm timed by the profiler, with the name of their phase
+PHASES = {
+    "updateParameters": "parameters",
+    "updateVelocity": "velocity",
+    "localBests": "lbest",
+    "updatePosition": "position",
+    "moveParticle": "move",
+    "repairBounds": "bounds",
+    "evaluate": "evaluation",
+    "updatePbest": "pbest",
+    "setGbest": "gbest",
+    "checknstop": "stopping",
+    "report": "reporting",
+    "saveCheckpoint": "checkpoint",
+}
+
+COUNTERS = ("evaluations", "bound violations", "pbest improvements", "gbest changes")
+
+
+class Profiler(Reporter):
+    """
+    Time every phase of the optimization loop and count what happens in it, e.g. to find out whether a slow run spends
+    its time in the objective, the velocity update, the bounds repair, the gbest search or the stopping criteria.
+
+    The profiler is attached like any reporter, Swarm(..., reporters=[Profiler()]). When the run starts it replaces the
+    methods of the swarm listed in PHASES by timed wrappers, on that swarm instance only, and gives the swarm its own
+    methods back when the run finishes, so a swarm without a profiler runs exactly the same code as before and pays
+    nothing. Each phase gets its own time, excluding the phases called
+    from it (e.g. "pbest" excludes "evaluation"), and the number of its calls. The counters are the evaluations, the
+    coordinates found outside the bounds, the pbest improvements and the gbest changes. In the asynchronous mode the
+    evaluations run in the background: they are counted but not timed, and neither are the pbest updates.
+
+    At the end of every run a summary table is written to the stream, see summary(). With trace, every timed call is
+    also recorded as an event, and writeTrace() saves them in the Chrome trace event format, which chrome://tracing
+    and Perfetto (ui.perfetto.dev) can load.
+
+    """
+
+    every = sys.maxsize  # the profiler only needs start and finish
+
+    def __init__(self, stream=None, summary=True, trace=False, maxEvents=1000000):
+        """
+        :param stream: file the summary is written to, defaults to sys.stdout
+        :param summary: if False, don't write the summary at the end of every run
+        :param trace: if True, record every timed call for writeTrace()
+        :param maxEvents: largest number of events kept, the following ones are dropped
+        """
+        self.stream = stream
+        self.printSummary = summary
+        self.maxEvents = maxEvents
+        self.events = [] if trace else None
+        self.droppedEvents = 0
+        self.swarm = None
+        self.seconds = dict.fromkeys(PHASES.values(), 0.0)
+        self.calls = dict.fromkeys(PHASES.values(), 0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.children = []  # time spent in the timed calls made from each timed call in progress
+        self.elapsed = 0.0  # total wall-clock time of the profiled runs
+        self.runStart = None
+        self.startEvaluations = 0  # evaluations of the swarm at the start of the run
+        self.origin = time.perf_counter()  # time 0 of the trace
+
+    def start(self, swarm):
+        if self.swarm is not swarm:
+            self.attach(swarm)
+        self.runStart = time.perf_counter()
+        self.startEvaluations = swarm.evaluations
+
+    def finish(self, statistics):
+        self.elapsed += time.perf_counter() - self.runStart
+        self.counters["evaluations"] += statistics.evaluations - self.startEvaluations
+        self.startEvaluations = statistics.evaluations
+        if self.printSummary:
+            self.write(self.stream if self.stream is not None else sys.stdout)
+        if self.swarm is not None:
+            self.detach()
+
+    def attach(self, swarm):
+        """
+        Function to replace the methods of the swarm by timed wrappers. It is called by start().
+
+        :param swarm: swarm to be profiled
+        """
+        if self.swarm is not None:
+            self.detach()
+        counts = {
+            "repairBounds": lambda args, result: ("bound violations", result),
+            "updatePbest": lambda args, result: ("pbest improvements", count_nonzero(swarm.improved)),
+            "setGbest": lambda args, result: ("gbest changes", 1),
+        }
+        for method, phase in PHASES.items():
+            setattr(swarm, method, self.timed(getattr(swarm, method), phase, counts.get(method)))
+        self.swarm = swarm
+
+    def detach(self):
+        """
+        Function to give the swarm back its own methods, the measurements are kept. It is called by finish().
+        """
+        for method in PHASES:
+            if method in vars(self.swarm):
+                delattr(self.swarm, method)
+        self.swarm.repairBounds = BOUNDARY_STRATEGIES[self.swarm.boundary]
+        self.swarm = None
+
+    def timed(self, function, phase, count=None):
+        """
+        Function to wrap a method of the swarm so that every call adds to the time of its phase.
+
+        :param function: bound method (or function) to be wrapped
+        :param phase: name of the phase
+        :param count: optional function of the arguments and result of a call, returning the name of a counter and
+                      the amount to add to it
+        :return: wrapper
+        """
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            self.children.append(0.0)
+            start = clock()
+            result = function(*args, **kwargs)
+            elapsed = clock() - start
+            self.seconds[phase] += elapsed - self.children.pop()
+            self.calls[phase] += 1
+            if self.children:
+                self.children[-1] += elapsed
+            if count is not None:
+                name, amount = count(args, result)
+                self.counters[name] += int(amount)
+            if self.events is not None:
+                self.record(phase, start, elapsed)
+            return result
+
+        return wrapper
+
+    def record(self, phase, start, elapsed):
+        """
+        Function to keep a timed call as a complete event of the trace, and the counters after every convergence
+        check (i.e. every iteration) as a counter event.
+        """
+        if len(self.events) >= self.maxEvents:
+            self.droppedEvents += 1
+            return
+        timestamp = (start - self.origin) * 1e6
+        self.events.append({"name": phase, "cat": "pso", "ph": "X", "ts": timestamp, "dur": elapsed * 1e6,
+                            "pid": os.getpid(), "tid": 0})
+        if phase == "stopping":
+            self.events.append({"name": "counters", "ph": "C", "ts": timestamp + elapsed * 1e6,
+                                "pid": os.getpid(), "tid": 0, "args": dict(
+                                    self.counters, evaluations=self.counters["evaluations"] + self.swarm.evaluations -
+                                    self.startEvaluations)})
+
+    def summary(self):
+        """
+        :return: dict with, for every phase that was called, its number of calls, its time in seconds and its share of
+                 the time of the runs; the counters; the total time of the runs, and the time spent outside the timed
+                 phases (the loop itself and the profiler)
+        """
+        phases = {phase: {"calls": self.calls[phase], "seconds": self.seconds[phase],
+                          "share": self.seconds[phase] / self.elapsed if self.elapsed > 0 else 0.0}
+                  for phase in self.seconds if self.calls[phase]}
+        return {"phases": phases, "counters": dict(self.counters), "elapsed": self.elapsed,
+                "other": self.elapsed - sum(self.seconds.values())}
+
+    def write(self, stream):
+        """
+        Function to write the summary as a table, phases sorted by decreasing time.
+
+        :param stream: file to write to
+        """
+        summary = self.summary()
+        stream.write("%-12s %10s %12s %8s %14s\n" % ("phase", "calls", "seconds", "share", "us per call"))
+        for phase, row in sorted(summary["phases"].items(), key=lambda item: -item[1]["seconds"]):
+            stream.write("%-12s %10d %12.6f %7.1f%% %14.2f\n" % (
+                phase, row["calls"], row["seconds"], 100 * row["share"], 1e6 * row["seconds"] / row["calls"]))
+        stream.write("%-12s %10s %12.6f %7.1f%%\n" % ("other", "", summary["other"], 100 * summary["other"] / (
+            summary["elapsed"] or 1.0)))
+        stream.write("%-12s %10s %12.6f\n" % ("total", "", summary["elapsed"]))
+        stream.write("   ".join("%s: %d" % item for item in summary["counters"].items()) + "\n")
+
+    def writeTrace(self, path):
+        """
+        Function to save the recorded events in the Chrome trace event format (JSON), to be opened with
+        chrome://tracing or Perfetto. The profiler must have been created with trace=True.
+
+        :param path: path of the file to write
+        """
+        if self.events is None:
+            raise Exception(path, "can't be written, the profiler was created without trace=True")
+        with open(path, "w") as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms",
+                       "otherData": {"droppedEvents": self.droppedEvents}}, file)
@@ -0,0 +1,189 @@
+from functools import cached_property
+import sys
+import time
+
+from numpy import isfinite, nan, sqrt
+
+
+class IterationStatistics:
+    """
+    This class holds the statistics of the swarm after an iteration, as passed to the reporters.
+
+    The statistics that need a pass over the whole swarm (mean and worst fitness, diversity) are computed the first
+    time they are read, so reporters that don't use them don't pay for them.
+
+    """
+
+    def __init__(self, swarm, iteration, elapsed):
+        """
+        :param swarm: swarm being optimized
+        :param iteration: number of iterations completed so far in the run
+        :param elapsed: wall-clock seconds since the start of the run
+        """
+        self.swarm = swarm
+        self.iteration = iteration
+        self.maxiterations = swarm.maxiterations
+        self.elapsed = elapsed
+        self.evaluations = swarm.evaluations
+        self.skippedEvaluations = swarm.skippedEvaluations
+        self.screenedEvaluations = swarm.screenedEvaluations
+        self.bestFitness = swarm.gbestFitness
+        self.bestViolation = swarm.gbestViolation  # constraint violation of gbest, 0 if feasible
+        self.gbest = swarm.gbest
+
+    @cached_property
+    def finiteFitnesses(self):
+        """
+        Fitness of the current positions of the particles that is finite: the positions whose objective was skipped
+        by cheap constraints or by the surrogate screening have an infinite fitness, which is left out of the
+        statistics.
+        """
+        fitnesses = self.swarm.fitnesses
+        finite = isfinite(fitnesses)
+        return fitnesses if finite.all() else fitnesses[finite]
+
+    @cached_property
+    def meanFitness(self):
+        """
+        Mean finite fitness of the current positions of the particles, nan if none is finite.
+        """
+        fitnesses = self.finiteFitnesses
+        return fitnesses.mean() if fitnesses.size else nan
+
+    @cached_property
+    def worstFitness(self):
+        """
+        Worst finite fitness among the current positions of the particles, nan if none is finite.
+        """
+        fitnesses = self.finiteFitnesses
+        if not fitnesses.size:
+            return nan
+        return fitnesses.max() if self.swarm.mode == "min" else fitnesses.min()
+
+    @cached_property
+    def diversity(self):
+        """
+        Mean distance of the particles from the centre of the swarm.
+        """
+        positions = self.swarm.positions
+        return sqrt(((positions - positions.mean(axis=0)) ** 2).sum(axis=1)).mean()
+
+
+class Reporter:
+    """
+    This class is the base of the progress reporters of the swarm.
+
+    A reporter is attached to the swarm through its reporters parameter. The swarm calls start() when a run begins,
+    report() after every iteration whose number is a multiple of the every attribute, and finish() when the run ends.
+    When no reporter is attached the optimization loop does no I/O and computes no statistics.
+
+    """
+
+    every = 1  # report every this many iterations
+
+    def start(self, swarm):
+        """
+        Function called at the beginning of an optimization run.
+
+        :param swarm: swarm being optimized
+        """
+        pass
+
+    def report(self, statistics):
+        """
+        Function called with the statistics of the swarm after an iteration.
+
+        :param statistics: IterationStatistics of the swarm
+        """
+        pass
+
+    def finish(self, statistics):
+        """
+        Function called with the statistics of the swarm at the end of an optimization run.
+
+        :param statistics: IterationStatistics of the swarm
+        """
+        pass
+
+
+class LogReporter(Reporter):
+    """
+    Write one line of statistics every few iterations, and a last one at the end of the run.
+
+    """
+
+    def __init__(self, every=100, stream=None):
+        """
+        :param every: number of iterations between two lines
+        :param stream: file to write to, defaults to sys.stdout
+        """
+        self.every = every
+        self.stream = stream
+
+    def report(self, statistics):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("Iteration number: %d   best fitness: %.6g   mean fitness: %.6g   diversity: %.6g   "
+                     "elapsed: %.2f s\n" % (statistics.iteration, statistics.bestFitness, statistics.meanFitness,
+                                            statistics.diversity, statistics.elapsed))
+
+    def finish(self, statistics):
+        if statistics.iteration % self.every:
+            self.report(statistics)
+
+
+class ProgressReporter(Reporter):
+    """
+    Keep a single progress line, in the style of tqdm, updated in place at most every refresh seconds:
+
+     45%|#########           | 4500/10000 [00:03<00:04, 1234.5 it/s, best=0.00123]
+
+    """
+
+    def __init__(self, stream=None, refresh=0.1, width=20):
+        """
+        :param stream: file to write to, defaults to sys.stderr
+        :param refresh: minimum number of seconds between two updates of the line
+        :param width: number of characters of the bar
+        """
+        self.stream = stream
+        self.refresh = refresh
+        self.width = width
+        self.lastUpdate = None
+        self.firstIteration = 0  # iteration the run started from, e.g. after a resume
+
+    def start(self, swarm):
+        self.lastUpdate = None
+        self.firstIteration = swarm.iteration
+
+    def report(self, statistics):
+        now = time.perf_counter()
+        if self.lastUpdate is None or now - self.lastUpdate >= self.refresh:
+            self.lastUpdate = now
+            self.write(statistics)
+
+    def finish(self, statistics):
+        self.write(statistics)
+        self.output().write("\n")
+
+    def output(self):
+        return self.stream if self.stream is not None else sys.stderr
+
+    def write(self, statistics):
+        """
+        Function to overwrite the progress line with the given statistics.
+        """
+        done = statistics.iteration / statistics.maxiterations if statistics.maxiterations else 1.0
+        filled = int(done * self.width)
+        # iterations per second of this run, whose elapsed time is all that is measured
+        rate = (statistics.iteration - self.firstIteration) / statistics.elapsed if statistics.elapsed > 0 else 0.0
+        remaining = (statistics.maxiterations - statistics.iteration) / rate if rate > 0 else 0.0
+        stream = self.output()
+        stream.write("\r%3d%%|%s%s| %d/%d [%s<%s, %.1f it/s, best=%.6g]" % (
+            100 * done, "#" * filled, " " * (self.width - filled), statistics.iteration, statistics.maxiterations,
+            self.clock(statistics.elapsed), self.clock(remaining), rate, statistics.bestFitness))
+        stream.flush()
+
+    @staticmethod
+    def clock(seconds):
+        minutes, seconds = divmod(int(seconds), 60)
+        return "%02d:%02d" % (minutes, seconds)
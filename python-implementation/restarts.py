@@ -0,0 +1,193 @@
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from numpy import asarray, median
+
+from seeding import *
+from stopping import StoppingCriterion
+from swarm import Swarm
+
+# shared-memory array of the best fitness over all the runs at every checked iteration, set in every worker process of a
+# MultiStart pool
+sharedBest = None
+
+
+class DominatedRun(StoppingCriterion):
+    """
+    Stop a run of a MultiStart that is clearly beaten by another run.
+
+    The runs are compared at equal iteration counts, so that a run started late in the pool is not judged against a
+    run that has been going for much longer: a shared-memory array (a multiprocessing.Array) holds, for every
+    iteration that is a multiple of every, the best gbest fitness any run had after that many iterations. At those
+    iterations the run publishes its gbest fitness to its entry if it beats the value there, and stops if its gbest is
+    worse than the value there by more than margin times the magnitude of that value plus an absolute tolerance, so
+    that a run converging to an optimum of 0 is not stopped for being a few orders of magnitude behind the best run. A
+    run is never stopped during its first grace iterations.
+
+    """
+
+    reason = "dominated by another run"
+
+    def __init__(self, bests, margin=0.5, tolerance=1e-6, grace=100, every=10):
+        """
+        :param bests: multiprocessing.Array("d") of maxiterations // every + 1 values, the best fitness over all the
+                      runs after every multiple of every iterations, initialized to the worst possible fitness
+        :param margin: relative margin, the gbest of the run is stopped if it is worse than the best one by more than
+                       margin * |best| + tolerance
+        :param tolerance: absolute margin added to the relative one
+        :param grace: number of iterations of the run before it can be stopped
+        :param every: number of iterations between two looks at the shared bests
+        """
+        self.bests = bests
+        self.margin = margin
+        self.tolerance = tolerance
+        self.grace = grace
+        self.every = every
+        self.first = 0
+
+    def start(self, swarm):
+        self.first = swarm.iteration
+
+    def update(self, swarm):
+        if swarm.iteration % self.every or swarm.iteration // self.every >= len(self.bests):
+            return False
+        index = swarm.iteration // self.every
+        with self.bests.get_lock():
+            if swarm.isBetter(swarm.gbestFitness, self.bests[index]):
+                self.bests[index] = swarm.gbestFitness
+            best = self.bests[index]
+        if swarm.iteration - self.first < self.grace:
+            return False
+        margin = self.margin * abs(best) + self.tolerance
+        return swarm.isBetter(best + margin if swarm.mode == "min" else best - margin, swarm.gbestFitness)
+
+
+class RestartResult:
+    """
+    This class holds the outcome of one run of a MultiStart.
+
+    """
+
+    def __init__(self, index, swarm, elapsed):
+        """
+        :param index: index of the run
+        :param swarm: swarm of the run, after optimize() returned
+        :param elapsed: wall-clock seconds taken by the run
+        """
+        self.index = index
+        self.gbest = swarm.gbest
+        self.gbestFitness = float(swarm.gbestFitness)
+        self.iterations = swarm.iteration
+        self.evaluations = swarm.evaluations
+        self.stopReason = swarm.stopReason
+        self.elapsed = elapsed
+
+
+def shareBest(bests):
+    """
+    Function run at the start of every worker process of a MultiStart pool, to make the shared best fitness array
+    available to the runs.
+
+    :param bests: multiprocessing.Array("d") of the best fitness over all the runs, see DominatedRun
+    """
+    global sharedBest
+    sharedBest = bests
+
+
+def runRestart(index, parameters, seed, earlyStop, margin, tolerance, grace, every):
+    """
+    Function run by a worker process for one run of a MultiStart.
+
+    :return: RestartResult of the run
+    """
+    start = time.perf_counter()
+    with Swarm(seed=seed, **parameters) as swarm:
+        if earlyStop:
+            swarm.stopping = swarm.stopping + [DominatedRun(sharedBest, margin, tolerance, grace, every)]
+        swarm.optimize()
+    return RestartResult(index, swarm, time.perf_counter() - start)
+
+
+class MultiStart:
+    """
+    This class runs independent restarts of the swarm in a process pool, and keeps the best of their results.
+
+    Every run gets its own random stream, spawned from one seed, so the runs don't overlap and the whole multi-start
+    is reproducible as long as no run is stopped early. The runs share their best fitness every few iterations through a
+    shared-memory array, and with earlyStop a run that is clearly beaten by another one after as many iterations stops
+    (see DominatedRun), which frees its worker for the next run.
+
+    The objective, and every parameter of the swarms, is pickled to the worker processes, so the objective must be
+    picklable, e.g. a module level function or a ScalarObjective wrapping one.
+
+    """
+
+    def __init__(self, runs, workers=None, seed=None, earlyStop=True, margin=0.5, tolerance=1e-6, grace=100, every=10,
+                 **parameters):
+        """
+        Function to store the configuration of the multi-start.
+
+        :param runs: number of independent runs
+        :param workers: number of worker processes, defaults to the number of cores
+        :param seed: seed of the multi-start, every run gets an independent stream spawned from it
+        :param earlyStop: if True, runs that are clearly beaten by another run stop early
+        :param margin: relative margin by which a run must be worse than the best run to be stopped, see DominatedRun
+        :param tolerance: absolute margin added to the relative one, see DominatedRun
+        :param grace: number of iterations of a run before it can be stopped early
+        :param every: number of iterations between two looks of a run at the shared best fitness
+        :param parameters: keyword parameters of the Swarm of every run (population_size, dimension, maxiterations,
+                           bounds, w, c1, c2, mode, objective, stopping, ...). The stopping criteria default to those
+                           of the Swarm, and with earlyStop a DominatedRun is added to them
+        """
+        if runs < 1:
+            raise Exception(runs, "is not a valid parameter, the number of runs must be at least 1")
+        self.runs = runs
+        self.workers = workers
+        self.seed = seed
+        self.earlyStop = earlyStop
+        self.margin = margin
+        self.tolerance = tolerance
+        self.grace = grace
+        self.every = every
+        self.parameters = parameters
+        self.mode = parameters.get("mode", "min")
+
+        self.results = []
+        self.best = None
+        self.gbest = None
+        self.gbestFitness = None
+        self.elapsed = 0.0
+
+    def optimize(self):
+        """
+        This function runs the restarts on the process pool and waits for all of them.
+
+        :return: gbest - the best solution over all the runs
+        """
+        start = time.perf_counter()
+        worst = math.inf if self.mode == "min" else -math.inf
+        bests = multiprocessing.Array("d", [worst] * (self.parameters["maxiterations"] // self.every + 1))
+        seeds = spawnGenerators(self.seed, self.runs)
+        with ProcessPoolExecutor(self.workers, initializer=shareBest, initargs=(bests,)) as executor:
+            futures = [executor.submit(runRestart, index, self.parameters, seeds[index], self.earlyStop, self.margin,
+                                       self.tolerance, self.grace, self.every) for index in range(self.runs)]
+            self.results = [future.result() for future in futures]
+        self.best = (min if self.mode == "min" else max)(self.results, key=lambda result: result.gbestFitness)
+        self.gbest, self.gbestFitness = self.best.gbest, self.best.gbestFitness
+        self.elapsed = time.perf_counter() - start
+        return self.gbest
+
+    def statistics(self):
+        """
+        :return: dict with the number of runs, the index and fitness of the best run, the median and worst fitness,
+                 the number of runs stopped early, the total evaluations and iterations, and the wall-clock time
+        """
+        fitness = asarray([result.gbestFitness for result in self.results])
+        return {"runs": len(self.results), "best": self.best.index, "bestFitness": self.gbestFitness,
+                "medianFitness": float(median(fitness)),
+                "worstFitness": float(fitness.max() if self.mode == "min" else fitness.min()),
+                "stoppedEarly": sum(result.stopReason == DominatedRun.reason for result in self.results),
+                "evaluations": sum(result.evaluations for result in self.results),
+                "iterations": sum(result.iterations for result in self.results), "elapsed": self.elapsed}
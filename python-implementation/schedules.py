@@ -0,0 +1,111 @@
+import math
+
+from numpy import sqrt
+
+
+class Schedule:
+    """
+    This class is the base of the schedules of the parameters w, c1 and c2 of the swarm.
+
+    A schedule is given to the swarm in place of a constant. The swarm resolves it once per iteration, before the
+    velocity update, and the whole swarm uses the resulting value, so a schedule costs one call per iteration
+    whatever the population size. A schedule depends only on the state of the swarm, so a run continued from a
+    checkpoint with the same schedules follows exactly the same values.
+
+    """
+
+    def __call__(self, swarm):
+        """
+        Function to compute the value of the parameter for the coming iteration.
+
+        :param swarm: swarm being optimized, swarm.iteration is the number of iterations already completed
+        :return: value of the parameter
+        """
+        raise NotImplementedError
+
+
+class Linear(Schedule):
+    """
+    The parameter moves linearly from start to end over maxiterations iterations, e.g. the classic inertia decay
+    from 0.9 to 0.4, or the time-varying acceleration coefficients (c1 from 2.5 to 0.5 and c2 from 0.5 to 2.5).
+
+    """
+
+    def __init__(self, start, end):
+        """
+        :param start: value at the first iteration
+        :param end: value at the last iteration
+        """
+        self.start = start
+        self.end = end
+
+    def __call__(self, swarm):
+        return self.start + (self.end - self.start) * swarm.iteration / swarm.maxiterations
+
+
+class Exponential(Schedule):
+    """
+    The parameter decays exponentially from start towards end: it moves most in the first iterations, and has
+    covered a fraction 1 - exp(-rate) of the way at the last iteration.
+
+    """
+
+    def __init__(self, start, end, rate=5.0):
+        """
+        :param start: value at the first iteration
+        :param end: value approached at the end of the run
+        :param rate: speed of the decay, relative to maxiterations
+        """
+        self.start = start
+        self.end = end
+        self.rate = rate
+
+    def __call__(self, swarm):
+        return self.end + (self.start - self.end) * math.exp(-self.rate * swarm.iteration / swarm.maxiterations)
+
+
+class DiversityAdaptive(Schedule):
+    """
+    The parameter follows the diversity of the swarm, i.e. the mean distance of the particles from the centre of the
+    swarm: it is high while the swarm is spread out and low once it has gathered, so the inertia stays large enough to
+    explore while the particles are far apart, and drops to let them refine once they agree. The diversity is
+    measured as a fraction of the diagonal of the bounds, which takes one pass over the positions per iteration.
+
+    """
+
+    def __init__(self, low=0.4, high=0.9, reference=0.29):
+        """
+        :param low: value when the swarm has collapsed onto a point
+        :param high: value when the diversity is reference or more
+        :param reference: diversity, as a fraction of the diagonal of the bounds, at which the value reaches high;
+                          0.29 is about that of a swarm spread uniformly over the bounds
+        """
+        self.low = low
+        self.high = high
+        self.reference = reference
+
+    def __call__(self, swarm):
+        positions = swarm.positions
+        diversity = sqrt(((positions - positions.mean(axis=0)) ** 2).sum(axis=1)).mean()
+        diagonal = sqrt(((swarm.upper - swarm.lower) ** 2).sum())
+        return self.low + (self.high - self.low) * min(1.0, diversity / (self.reference * diagonal))
+
+
+def constriction(c1=2.05, c2=2.05):
+    """
+    Function to compute the parameters of Clerc's constriction coefficient. The constricted velocity update
+
+    Velocity(T+1) = chi * (Velocity(T) + c1 * random_num1 * (pbest - position) + c2 * random_num2 * (gbest - position))
+
+    with chi = 2 / |2 - phi - sqrt(phi^2 - 4 * phi)| and phi = c1 + c2 > 4, is the usual update with w = chi and the
+    acceleration coefficients multiplied by chi, so it needs nothing more from the swarm.
+
+    :param c1: cognitive acceleration coefficient
+    :param c2: social acceleration coefficient
+    :return: w, c1, c2 to give to the swarm
+    """
+    phi = c1 + c2
+    if phi <= 4:
+        raise Exception(phi, "is not a valid parameter, the constriction coefficient needs c1 + c2 > 4")
+    chi = 2 / abs(2 - phi - math.sqrt(phi * phi - 4 * phi))
+    return chi, chi * c1, chi * c2
@@ -0,0 +1,59 @@
+import json
+
+import numpy.random
+from numpy.random import Generator, SeedSequence, default_rng
+
+
+def makeGenerator(seed=None):
+    """
+    Function to turn the seed given to the swarm into a random number generator.
+
+    :param seed: None for a fresh, unpredictable stream, an int or SeedSequence for a reproducible stream, or a
+                 numpy.random.Generator to be used as it is
+    :return: numpy.random.Generator
+    """
+    if isinstance(seed, Generator):
+        return seed
+    return default_rng(seed)
+
+
+def spawnGenerators(seed, count):
+    """
+    Function to derive independent random number generators from one seed, e.g. one per restart or worker process.
+
+    The streams are spawned from a SeedSequence, so they don't overlap, and the same seed always gives the same
+    streams in the same order.
+
+    :param seed: int, SeedSequence or numpy.random.Generator to derive the streams from
+    :param count: number of streams
+    :return: list of count numpy.random.Generator
+    """
+    if isinstance(seed, Generator):
+        return seed.spawn(count)
+    if not isinstance(seed, SeedSequence):
+        seed = SeedSequence(seed)
+    return [default_rng(child) for child in seed.spawn(count)]
+
+
+def generatorState(rng):
+    """
+    Function to capture the complete state of a random number generator as a string, e.g. to save it in a checkpoint.
+
+    :param rng: numpy.random.Generator
+    :return: JSON string of the state of its bit generator
+    """
+    return json.dumps(rng.bit_generator.state)
+
+
+def restoreGenerator(state):
+    """
+    Function to recreate a random number generator from a state captured by generatorState. The new generator
+    continues with exactly the numbers the original one would have drawn next.
+
+    :param state: string returned by generatorState
+    :return: numpy.random.Generator
+    """
+    state = json.loads(state)
+    bitGenerator = getattr(numpy.random, state["bit_generator"])()
+    bitGenerator.state = state
+    return Generator(bitGenerator)
@@ -0,0 +1,202 @@
+import time
+
+from numpy import empty
+
+
+class RingBuffer:
+    """
+    This class is a fixed-size ring buffer of numbers. Appending overwrites the oldest value once the buffer is full, so
+    every operation takes constant time and no memory is allocated after construction.
+
+    """
+
+    def __init__(self, capacity):
+        """
+        Function to allocate the buffer.
+
+        :param capacity: number of values kept
+        """
+        self.values = empty(capacity)
+        self.capacity = capacity
+        self.count = 0  # number of values appended so far, the next one goes to index count % capacity
+
+    def append(self, value):
+        """
+        Function to append a value, overwriting the oldest one if the buffer is full.
+
+        :param value: value to be appended
+        """
+        self.values[self.count % self.capacity] = value
+        self.count += 1
+
+    def full(self):
+        """
+        :return: True if the buffer holds capacity values
+        """
+        return self.count >= self.capacity
+
+    def oldest(self):
+        """
+        :return: the oldest value in the buffer
+        """
+        return self.values[self.count % self.capacity if self.full() else 0]
+
+    def newest(self):
+        """
+        :return: the most recently appended value
+        """
+        return self.values[(self.count - 1) % self.capacity]
+
+    def clear(self):
+        """
+        Function to empty the buffer.
+        """
+        self.count = 0
+
+
+class StoppingCriterion:
+    """
+    This class is the base of the stopping criteria of the swarm.
+
+    The swarm calls start() when an optimization run begins and update() once per iteration, after the pbests have been
+    updated. update() returns True when the run should stop, and must do constant work per call so that checking for
+    convergence never dominates an iteration.
+
+    """
+
+    reason = "stopping criterion met"  # description reported by the swarm when this criterion stops a run
+
+    def start(self, swarm):
+        """
+        Function to reset the state of the criterion at the beginning of a run.
+
+        :param swarm: swarm being optimized
+        """
+        pass
+
+    def update(self, swarm):
+        """
+        Function to check the criterion after an iteration.
+
+        :param swarm: swarm being optimized
+        :return: True, if the run should stop, else False
+        """
+        return False
+
+
+class Stagnation(StoppingCriterion):
+    """
+    Stop when the fitness of gbest has not improved by more than a tolerance over a window of iterations.
+
+    The gbest fitness never gets worse, so it is enough to compare the newest value of a ring buffer of the last window
+    fitnesses with the oldest one. The buffer is primed from the convergence history of the swarm when a run starts, so
+    a run continued from a checkpoint stops exactly where the original one would have.
+
+    """
+
+    reason = "gbest fitness stagnated"
+
+    def __init__(self, window=50, tolerance=0.0):
+        """
+        :param window: number of iterations over which the gbest fitness is compared
+        :param tolerance: largest change of the gbest fitness over the window that still counts as stagnation
+        """
+        self.tolerance = tolerance
+        self.history = RingBuffer(window)
+
+    def start(self, swarm):
+        self.history.clear()
+        for fitness in swarm.allGbests[-self.history.capacity:]:
+            self.history.append(fitness)
+
+    def update(self, swarm):
+        self.history.append(swarm.gbestFitness)
+        return self.history.full() and abs(self.history.newest() - self.history.oldest()) <= self.tolerance
+
+
+class TargetFitness(StoppingCriterion):
+    """
+    Stop when the fitness of gbest is at least as good as a target value, and gbest is feasible (with constraints, an
+    infeasible gbest may have any fitness, e.g. a penalized one, so it never counts).
+
+    """
+
+    reason = "target fitness reached"
+
+    def __init__(self, target):
+        """
+        :param target: fitness value to be reached, below it in "min" mode and above it in "max" mode
+        """
+        self.target = target
+
+    def update(self, swarm):
+        return swarm.gbestViolation == 0 and not swarm.isBetter(self.target, swarm.gbestFitness)
+
+
+class TimeBudget(StoppingCriterion):
+    """
+    Stop when the optimization runs of the swarm have taken more than a given wall-clock time in total, including the
+    earlier runs of the swarm (e.g. the epochs of an island, or the runs before a checkpoint), see swarm.elapsed.
+
+    """
+
+    reason = "time budget exhausted"
+
+    def __init__(self, seconds):
+        """
+        :param seconds: wall-clock time allowed for the runs of the swarm
+        """
+        self.seconds = seconds
+        self.deadline = None
+
+    def start(self, swarm):
+        self.deadline = time.perf_counter() + self.seconds - swarm.elapsed
+
+    def update(self, swarm):
+        return time.perf_counter() >= self.deadline
+
+
+class EvaluationBudget(StoppingCriterion):
+    """
+    Stop when the swarm has used a given number of fitness evaluations in total, including those of the initial
+    population and of its earlier runs (e.g. the epochs of an island, or the runs before a checkpoint), like
+    maxiterations is a budget of the swarm as a whole.
+
+    """
+
+    reason = "evaluation budget exhausted"
+
+    def __init__(self, evaluations):
+        """
+        :param evaluations: number of fitness evaluations allowed for the swarm
+        """
+        self.evaluations = evaluations
+
+    def update(self, swarm):
+        return swarm.evaluations >= self.evaluations
+
+
+class DiameterCollapse(StoppingCriterion):
+    """
+    Stop when the swarm has collapsed onto a point, i.e. when the largest extent of the particle positions along any
+    variable falls below a threshold.
+
+    Unlike the other criteria this one looks at every position, which is O(population_size * dimension) per check, so
+    it is only done on the iterations that are a multiple of every.
+
+    """
+
+    reason = "swarm diameter collapsed"
+
+    def __init__(self, threshold, every=10):
+        """
+        :param threshold: extent of the swarm below which it is considered collapsed
+        :param every: number of iterations between two checks
+        """
+        self.threshold = threshold
+        self.every = every
+
+    def update(self, swarm):
+        if swarm.iteration % self.every:
+            return False
+        return (swarm.positions.max(axis=0) - swarm.positions.min(axis=0)).max() < self.threshold
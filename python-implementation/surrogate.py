@@ -0,0 +1,215 @@
+from numpy import (arange, argpartition, argsort, ceil, einsum, empty, flatnonzero, isfinite, linalg, maximum, sqrt,
+                   take, take_along_axis, zeros)
+
+
+class Surrogate:
+    """
+    This class is the base of the surrogate models of the swarm: cheap regression models of the objective, trained
+    incrementally on the evaluated positions and their fitness, see Screening.
+
+    The training points are kept in a ring buffer of capacity positions, so that the model follows the region the swarm
+    is currently exploring and its cost per prediction stays bounded. Subclasses implement predict().
+
+    """
+
+    def __init__(self, capacity=2000):
+        """
+        :param capacity: largest number of training points kept, the oldest ones are replaced first
+        """
+        self.capacity = capacity
+        self.positions = None
+        self.fitness = None
+        self.size = 0  # number of training points stored
+        self.next = 0  # row of the next training point in the buffer
+
+    def update(self, positions, fitness):
+        """
+        Function to add evaluated positions to the training points.
+
+        :param positions: (n, dimension) array of positions
+        :param fitness: array of their n fitness values
+        """
+        if self.positions is None:
+            self.positions = empty((self.capacity, positions.shape[1]))
+            self.fitness = empty(self.capacity)
+        positions, fitness = positions[-self.capacity:], fitness[-self.capacity:]
+        rows = (self.next + arange(len(positions))) % self.capacity
+        self.positions[rows] = positions
+        self.fitness[rows] = fitness
+        self.next = (self.next + len(positions)) % self.capacity
+        self.size = min(self.size + len(positions), self.capacity)
+
+    def state(self):
+        """
+        :return: training points, their fitness and the next row of the buffer, to be saved in a checkpoint
+        """
+        if self.positions is None:
+            return zeros((0, 0)), zeros(0), 0
+        return self.positions[:self.size], self.fitness[:self.size], self.next
+
+    def restore(self, positions, fitness, next):
+        """
+        Function to restore the training points saved by state().
+        """
+        self.positions, self.fitness = None, None
+        self.size = self.next = 0
+        if len(positions):
+            self.update(positions, fitness)
+            self.next = next
+
+    def nearest(self, positions, k):
+        """
+        Function to find the k nearest training points of every position.
+
+        :param positions: (n, dimension) array of positions
+        :param k: number of neighbours, at most size
+        :return: indices, distances - (n, k) arrays of the rows of the neighbours in the training points, and of their
+                 euclidean distances to the positions, nearest first
+        """
+        points = self.positions[:self.size]
+        squared = einsum("ij,ij->i", positions, positions)[:, None] + einsum("ij,ij->i", points, points)[None, :]
+        squared -= 2 * positions @ points.T
+        maximum(squared, 0, out=squared)
+        if k < self.size:
+            indices = argpartition(squared, k - 1, axis=1)[:, :k]
+        else:
+            indices = arange(self.size)[None, :].repeat(len(positions), axis=0)
+        distances = take_along_axis(squared, indices, axis=1)
+        order = argsort(distances, axis=1)
+        return take_along_axis(indices, order, axis=1), sqrt(take_along_axis(distances, order, axis=1))
+
+    def predict(self, positions):
+        """
+        Function to predict the fitness of a batch of positions.
+
+        :param positions: (n, dimension) array of positions
+        :return: float array of n predicted fitness values
+        """
+        raise NotImplementedError
+
+
+class NearestNeighbors(Surrogate):
+    """
+    k-nearest-neighbour regression: the prediction is the mean of the fitness of the k nearest training points,
+    weighted by the inverse of their distance. A position equal to a training point gets its fitness.
+
+    """
+
+    def __init__(self, k=5, capacity=2000):
+        """
+        :param k: number of neighbours
+        :param capacity: largest number of training points kept
+        """
+        super().__init__(capacity)
+        self.k = k
+
+    def predict(self, positions):
+        indices, distances = self.nearest(positions, min(self.k, self.size))
+        weights = 1.0 / maximum(distances, 1e-300)
+        weights[distances[:, 0] == 0] = 0.0
+        weights[distances[:, 0] == 0, 0] = 1.0
+        return (weights * take(self.fitness, indices)).sum(axis=1) / weights.sum(axis=1)
+
+
+class RadialBasis(Surrogate):
+    """
+    Local radial basis function interpolation: for every position, a cubic RBF with a constant term,
+    f(x) = sum_i lambda_i |x - x_i| ** 3 + c, is fitted exactly through its nearest training points, and evaluated at
+    the position. The small linear systems of all the positions of a batch are solved together, as one stacked solve.
+    A ridge term, relative to the spread of the neighbours but never below an absolute minimum, keeps the systems
+    solvable when training points coincide. When the neighbours are all (nearly) the same point, or the prediction is
+    not finite, the prediction is the mean fitness of the neighbours.
+
+    """
+
+    def __init__(self, neighbors=20, capacity=2000, ridge=1e-10, minimum=1e-12):
+        """
+        :param neighbors: number of training points every local model is fitted on
+        :param capacity: largest number of training points kept
+        :param ridge: ridge term added to the diagonal of the systems, relative to the mean of their entries
+        :param minimum: smallest ridge term; systems whose mean entry is not larger are degenerate
+        """
+        super().__init__(capacity)
+        self.neighbors = neighbors
+        self.ridge = ridge
+        self.minimum = minimum
+
+    def predict(self, positions):
+        indices, distances = self.nearest(positions, min(self.neighbors, self.size))
+        n, m = indices.shape
+        local = self.positions[indices]  # (n, m, dimension)
+        # pairwise squared distances of the neighbours from their Gram matrix, in (n, m, m) rather than (n, m, m, d)
+        gram = einsum("nid,njd->nij", local, local)
+        norms = gram[:, arange(m), arange(m)]
+        squared = norms[:, :, None] + norms[:, None, :] - 2 * gram
+        maximum(squared, 0, out=squared)
+        squared[:, arange(m), arange(m)] = 0.0
+        systems = zeros((n, m + 1, m + 1))
+        systems[:, :m, :m] = sqrt(squared) ** 3
+        spread = systems[:, :m, :m].mean(axis=(1, 2))
+        systems[:, arange(m), arange(m)] += maximum(spread * self.ridge, self.minimum)[:, None]
+        systems[:, :m, m] = systems[:, m, :m] = 1.0
+        values = zeros((n, m + 1))
+        values[:, :m] = take(self.fitness, indices)
+        coefficients = linalg.solve(systems, values[:, :, None])[:, :, 0]
+        predicted = einsum("nm,nm->n", coefficients[:, :m], distances ** 3) + coefficients[:, m]
+        degenerate = (spread <= self.minimum) | ~isfinite(predicted)
+        predicted[degenerate] = values[degenerate, :m].mean(axis=1)
+        return predicted
+
+
+class Screening:
+    """
+    This class is the surrogate pre-screening of the swarm: in every iteration, a surrogate model predicts the fitness
+    of the new positions, and only the particles whose new position is predicted to beat their pbest are evaluated with
+    the objective, the most promising first, up to budget times the population size. A share explore of the other
+    particles, drawn at random, is evaluated as well, so that the model keeps learning where it is wrong, and the
+    position predicted best is always evaluated.
+
+    The particles that are not evaluated keep their pbest; they get the worst possible fitness, like the positions
+    skipped by cheap constraints, and are counted in swarm.screenedEvaluations. The model is trained on every position
+    evaluated with the objective, and the screening starts once it holds warmup training points (by default twice the
+    population size), before which everything is evaluated.
+
+    """
+
+    def __init__(self, model=None, budget=0.5, explore=0.1, warmup=None):
+        """
+        :param model: Surrogate, defaults to NearestNeighbors()
+        :param budget: largest share of the population evaluated per iteration for predicted improvements
+        :param explore: share of the other particles evaluated per iteration
+        :param warmup: number of training points needed before screening starts
+        """
+        self.model = model if model is not None else NearestNeighbors()
+        self.budget = budget
+        self.explore = explore
+        self.warmup = warmup
+
+    def select(self, positions, swarm):
+        """
+        Function to choose the particles whose new position is evaluated with the objective.
+
+        :param positions: (population_size, dimension) array of the new positions
+        :param swarm: the swarm, for its pbests, mode and random number generator
+        :return: boolean mask of the positions to evaluate, or None to evaluate all of them
+        """
+        n = len(positions)
+        if self.model.size < (self.warmup if self.warmup is not None else 2 * n):
+            return None
+        predicted = self.model.predict(positions)
+        gain = swarm.pbestFitness - predicted if swarm.mode == "min" else predicted - swarm.pbestFitness
+        promising = flatnonzero(gain > 0)
+        promising = promising[argsort(-gain[promising], kind="stable")][:int(ceil(self.budget * n))]
+        selected = zeros(n, dtype=bool)
+        selected[promising] = True
+        selected[swarm.bestOf(predicted)] = True
+        others = flatnonzero(~selected)
+        selected[others[swarm.rng.random(len(others)) < self.explore]] = True
+        return selected
+
+    def update(self, positions, fitness):
+        """
+        Function to train the model on positions evaluated with the objective.
+        """
+        if len(positions):
+            self.model.update(positions, fitness)
@@ -1,10 +1,25 @@
-from numpy import *
-import matplotlib.pyplot as plt
-import scipy.linalg
-import sys
-import math
+import time
+
+from numpy import (arange, argmax, argmin, argsort, array, asarray, clip, copyto, dtype as numpyDtype, empty,
+                   empty_like, float32, float64, full, greater, inf, intp, less, multiply, ndarray, ones, subtract,
+                   take, zeros)
+
+from boundary import *
+from cache import *
+from checkpoint import *
+from constraints import *
+from evaluator import *
+from history import *
+from localsearch import *
+from objective import *
+from profiler import *
+from reporter import *
+from schedules import *
+from seeding import *
+from stopping import *
+from surrogate import *
+from topology import *
 
-from particle import *
 
 class Swarm:
     """
@@ -18,83 +33,939 @@ class Swarm:
     value that is tracked by the particle swarm optimizer is the best value, obtained so far by any particle in the
     population. This best value is a global best and called gbest.
 
+    The swarm is stored as a structure of arrays: row i of positions, velocities and pbests belongs to particle i, and
+    pbestFitness[i] is the fitness of pbests[i]. Every step of the algorithm is applied to the whole swarm at once with
+    array operations, instead of looping over particle objects.
+
     """
 
-    def __init__(self, population_size, dimension, maxiterations, bounds, w, c1, c2, mode):
+    def __init__(self, population_size, dimension, maxiterations, bounds, w, c1, c2, mode, objective=None, workers=None,
+                 backend="process", boundary="random", stopping=None, reporters=None,
+                 seed=None, cache=None, checkpoint=None, checkpointInterval=60.0,
+                 historyLimit=None, topology=None, vmax=None, dtype="float64", constraints=None, screening=None,
+                 refinement=None):
         """
         Function to initialize the swarm, and store the constant parameters
 
         :param population_size: number of particles in the population
         :param dimension: number of variables in each particle
-        :param bounds: [lower-bound, upper-bound] range of the variables, assuming each variable has same domain bounds
-        :param w: inertia weight of the particle
-        :param c1: constant 1 for controlling velocity update
-        :param c2: constant 2 for controlling velocity update
+        :param bounds: [lower-bound, upper-bound] range of the variables, each bound is either a number shared by all
+                       the variables or a sequence with one value per variable
+        :param w: inertia weight of the particle, a number or a Schedule (e.g. Linear(0.9, 0.4)) resolved once per
+                  iteration; see also constriction()
+        :param c1: constant 1 for controlling velocity update, a number or a Schedule
+        :param c2: constant 2 for controlling velocity update, a number or a Schedule
+        :param mode: mode indicates whether the problem is to be minimized or maximized
+        :param objective: batched fitness function, taking an (n, dimension) array of positions and returning n fitness
+                          values; wrap functions that score a single position in ScalarObjective. If not given, the
+                          fitness method of the swarm is used, and if it isn't overridden either, the swarm is meant
+                          to be driven by ask() and tell(), which evaluate the initial population too
+        :param workers: if given, evaluate the positions of every iteration in parallel on this many workers, which
+                        are kept alive for the whole run; see ParallelEvaluator. Call close() when done
+        :param backend: "process" (objective must be picklable) or "thread" (objective should release the GIL)
+        :param boundary: what to do with coordinates that leave the bounds: "random" redraws them within the bounds,
+                         "clip" moves them onto the nearest bound, "reflect" mirrors them back in and reverses their
+                         velocity, "absorb" stops them on the nearest bound with zero velocity
+        :param stopping: list of StoppingCriterion, the run stops as soon as any of them is met; defaults to stopping
+                         when the gbest fitness has not changed for 50 iterations
+        :param reporters: list of Reporter that receive the statistics of the swarm during a run, e.g. LogReporter or
+                          ProgressReporter; without reporters the optimization is silent
+        :param seed: seed of the random numbers of the swarm: None for an unpredictable run, an int or
+                     numpy.random.SeedSequence for a reproducible one, or a numpy.random.Generator to draw from
+        :param cache: FitnessCache to put in front of the objective, so that positions already evaluated (up to the
+                      resolution of the cache) are not evaluated again; with workers, only the misses are sent to them
+        :param checkpoint: path of a file to which optimize() saves the state of the swarm every checkpointInterval
+                           seconds and at the end of the run, see saveCheckpoint; None to disable checkpointing
+        :param checkpointInterval: wall-clock seconds between two checkpoints; a checkpoint costs a few milliseconds,
+                                   so the default keeps the overhead far below 1%
+        :param historyLimit: if given, allGbests only keeps (at least) the last historyLimit gbest fitnesses, so that
+                             memory doesn't grow with the number of iterations; record the full history to disk with
+                             a HistoryRecorder instead. It must not be smaller than the window of the Stagnation
+                             criterion
+        :param topology: neighbourhood topology, a Topology instance or its name ("star" (default, gbest), "ring",
+                         "vonneumann" or "random"); with other topologies than star each particle follows the best
+                         pbest of its neighbourhood instead of the gbest
+        :param vmax: if given, the largest absolute velocity along each variable, a number shared by all the variables
+                     or a sequence with one value per variable, e.g. a fraction of the width of the bounds
+        :param dtype: precision of the positions and velocities, "float64" or "float32" (half the memory and
+                      bandwidth); fitness values are always kept in float64
+        :param constraints: Constraints of the problem, or a list of Constraint handled with Deb's feasibility rules;
+                            the pbests and the gbest are then chosen by fitness and violation, see Constraints. Not
+                            supported by optimizeAsync
+        :param screening: Screening, to evaluate with the objective only the new positions that a surrogate model
+                          predicts to beat the pbest of their particle, see Screening. Not supported by optimizeAsync
+        :param refinement: Refinement, to run a local search from gbest periodically or when the swarm stagnates, and
+                           feed the improved position back as a pbest, see Refinement. It needs the objective, and is
+                           supported neither with constraints nor by optimizeAsync
         """
-        # initialize global variables
-        self.allGbests = []  # list to store all the gbests till some iteration
-        self.maxiterations = maxiterations  # maximum number of iterations allowed
-        self.mode = mode  # store the mode of the problem
+        self.configure(population_size=population_size, dimension=dimension, maxiterations=maxiterations,
+                       bounds=bounds, w=w, c1=c1, c2=c2, mode=mode, objective=objective, workers=workers,
+                       backend=backend, boundary=boundary, stopping=stopping, reporters=reporters, seed=seed,
+                       cache=cache, checkpoint=checkpoint, checkpointInterval=checkpointInterval,
+                       historyLimit=historyLimit, topology=topology, vmax=vmax, dtype=dtype, constraints=constraints,
+                       screening=screening, refinement=refinement)
 
-        # initialize population
-        self.swarm = []
-        for i in range(population_size):
-            self.swarm.append(Particle(w, c1, c2, dimension, bounds))
+        # initialize population, one row per particle; these arrays are allocated once and updated in place
+        self.positions = self.rng.uniform(low=self.lower, high=self.upper, size=(population_size, dimension)).astype(
+            self.dtype, copy=False)
+        self.velocities = self.rng.uniform(-0.5, 0.5, size=(population_size, dimension)).astype(self.dtype, copy=False)
+        self.pbests = self.positions.copy()  # initially the first position will be best position of each particle
+        self.evaluated = objective is not None or type(self).fitness is not Swarm.fitness
+        if self.evaluated:
+            # no pbests to compare with yet: the initial population is evaluated in full, never screened
+            fitness, self.pbestViolations = self.score(self.pbests, screen=False)
+            self.pbestFitness = array(fitness, dtype=float64)
+            self.evaluations += population_size
+        else:
+            # without an objective, the first ask() hands the initial population out to be evaluated
+            self.pbestFitness = full(population_size, inf if mode == "min" else -inf)
+            self.pbestViolations = full(population_size, inf) if constraints is not None else None
+        self.fitnesses = self.pbestFitness.copy()  # fitness of the current position of each particle
+        # total constraint violation of the pbests and of the current positions, None without constraints
+        self.violations = self.pbestViolations.copy() if self.pbestViolations is not None else None
 
         # initialize gbest
-        self.gbest = self.updateGbest(self.swarm)
-        # print(self.gbest)
+        self.updateGbest()
+        self.updateParameters()
+
+    def configure(self, *, population_size, dimension, maxiterations, bounds, w, c1, c2, mode, objective, workers,
+                  backend, boundary, stopping, reporters, seed, cache, checkpoint, checkpointInterval, historyLimit,
+                  topology, vmax, dtype, constraints, screening, refinement):
+        """
+        Function to validate and store the parameters of the swarm, everything __init__ does except creating the
+        population. The parameters are those of __init__, passed by keyword.
+        """
+        if mode not in ("min", "max"):
+            raise Exception(mode, "is not a valid parameter, accepted parameters: 'min' or 'max'")
+        if numpyDtype(dtype) not in (float32, float64):
+            raise Exception(dtype, "is not a valid parameter, accepted parameters: 'float32' or 'float64'")
+        if boundary not in BOUNDARY_STRATEGIES:
+            raise Exception(boundary, "is not a valid parameter, accepted parameters: " + ", ".join(
+                "'%s'" % name for name in BOUNDARY_STRATEGIES))
+
+        # initialize global variables
+        self.allGbests = []  # list to store the fitness of the gbest after every iteration
+        self.historyLimit = historyLimit
+        self.iteration = 0  # number of iterations done so far
+        self.checkpoint = checkpoint
+        self.checkpointInterval = checkpointInterval
+        self.stopping = stopping if stopping is not None else [Stagnation(50)]  # convergence criteria
+        self.stopReason = None  # reason of the criterion that stopped the last run, None if it used all iterations
+        self.stoppingStarted = False  # False until the stopping criteria are started, by a run or the first tell()
+        self.asked = None  # positions returned by ask() and waiting for tell(), if any
+        self.reporters = reporters if reporters is not None else []  # observers of the optimization progress
+        self.evaluations = 0  # number of fitness evaluations done so far
+        self.skippedEvaluations = 0  # evaluations of the objective skipped by the cheap constraints
+        self.screenedEvaluations = 0  # evaluations of the objective saved by the surrogate screening
+        self.evaluationsPerSecond = 0.0  # throughput of the last optimization run
+        self.elapsed = 0.0  # wall-clock seconds spent in all the optimization runs of the swarm, saved in checkpoints
+        self.maxiterations = maxiterations  # maximum number of iterations allowed
+        self.mode = mode  # store the mode of the problem
+        self.population_size = population_size
+        self.dimension = dimension
+        self.bounds = bounds
+        self.lower, self.upper = parseBounds(bounds, dimension)  # per variable bounds
+        self.boundary = boundary
+        self.repairBounds = BOUNDARY_STRATEGIES[boundary]
+        self.rng = makeGenerator(seed)  # every random number of the swarm is drawn from this generator
+        self.dtype = numpyDtype(dtype)
+        # work arrays of the updates, so that an iteration allocates no (population_size, dimension) array
+        self.scratch = empty((population_size, dimension), dtype=self.dtype)
+        self.outside = empty((population_size, dimension), dtype=bool)
+        self.improved = empty(population_size, dtype=bool)
+        self.column = empty((population_size, 1), dtype=self.dtype)
+        self.lbests = None  # work arrays of localBests, allocated on its first call
+        # the random coefficients of the velocity update are drawn for a block of iterations at once
+        self.coefficientBlock = int(clip(65536 // population_size, 1, 64))
+        self.coefficients = None
+        self.coefficientIndex = 0
+        # w, c1 and c2 hold the values used by the next velocity update, schedules are resolved into them
+        self.w = w
+        self.c1 = c1
+        self.c2 = c2
+        self.schedules = {name: value for name, value in (("w", w), ("c1", c1), ("c2", c2))
+                          if isinstance(value, Schedule)}
+        self.vmax = self.vmin = None
+        if vmax is not None:
+            self.vmax = asarray(vmax, dtype=float) * ones(dimension)
+            if (self.vmax <= 0).any():
+                raise Exception(vmax, "is not a valid parameter, the maximum velocity must be positive")
+            self.vmin = -self.vmax
+        # batched fitness function, wrapped in the worker pool and then in the cache if they are used
+        self.objective = objective if objective is not None else self.fitness
+        self.evaluator = None
+        if workers is not None:
+            self.evaluator = self.objective = ParallelEvaluator(self.objective, workers=workers, backend=backend)
+        self.cache = cache
+        if cache is not None:
+            cache.objective = self.objective
+            self.objective = cache
+        if topology is None:
+            topology = Star()
+        elif isinstance(topology, str):
+            if topology not in TOPOLOGIES:
+                raise Exception(topology, "is not a valid parameter, accepted parameters: " + ", ".join(TOPOLOGIES))
+            topology = TOPOLOGIES[topology]()
+        self.topology = topology
+        self.neighbors = topology.neighbors(population_size, self.rng)
+        if constraints is not None and not isinstance(constraints, Constraints):
+            constraints = Constraints(constraints)
+        self.constraints = constraints
+        self.screening = screening
+        if refinement is not None and (objective is None or constraints is not None):
+            raise Exception(refinement, "needs the objective of the swarm, and is not supported with constraints")
+        self.refinement = refinement
 
-    def optimize(self):
+    def optimize(self, iterations=None):
         """
         This function will start the optimization process of PSO.
 
         -----Steps-----
-        Step 1 : evaluate gbest of whole population
-        Step 2 : Update particles' velocity
-        Step 3 : Update particles' position
-        Step 4 : Update pbest of each particle
-        Step 5 : Check for convergence, stop and return gbest, if convergence is achieved, else GOTO: Step 1
+        Step 1 : Update particles' velocity
+        Step 2 : Update particles' position
+        Step 3 : Update pbest of each particle, and gbest if one of the new pbests beats it
+        Step 4 : Check for convergence, stop and return gbest, if convergence is achieved, else GOTO: Step 1
 
+        It is a loop over ask() (steps 1 and 2), the objective of the swarm (and the constraints, see score), and
+        tell() (steps 3 and 4), with the reporting and checkpointing of the run.
+
+        maxiterations is the budget of the swarm as a whole: a run continues from the iterations already done, e.g.
+        by a run that was stopped early or by the run a checkpoint was saved from, up to maxiterations.
+
+        :param iterations: if given, stop after at most this many iterations, e.g. to run the swarm in epochs;
+                           schedules still see maxiterations as the length of the whole run
         :return: gbest - the solution of the optimization process
         """
-        for i in range(self.maxiterations):
-            print("Iteration number: ",i)
-            self.updateGbest(self.swarm)
-            self.allGbests.append(self.gbest)
-
-            for j in range(len(self.swarm)):
-                self.swarm[j].updateVelocity(self.gbest)
-                self.swarm[j].updatePosition()
-                self.swarm[j].updatePbest(self.mode)
-            if self.checknstop():
+        start, startEvaluations = time.perf_counter(), self.evaluations
+        self.startStopping()
+        self.startReporting()
+        nextCheckpoint = start + self.checkpointInterval
+        last = self.maxiterations if iterations is None else min(self.maxiterations, self.iteration + iterations)
+        clock = start
+        while self.iteration < last:
+            positions = self.ask()
+            stop = self.tell(positions, *self.score(positions))
+            if self.reporters:
+                self.report(self.iteration, start)
+            now = time.perf_counter()
+            self.elapsed += now - clock
+            clock = now
+            if self.checkpoint is not None and now >= nextCheckpoint:
+                self.saveCheckpoint(self.checkpoint)
+                nextCheckpoint = time.perf_counter() + self.checkpointInterval
+            if stop:
                 break
+        self.updateThroughput(start, startEvaluations)
+        if self.checkpoint is not None:
+            self.saveCheckpoint(self.checkpoint)
+        self.finishReporting(self.iteration, start)
         return self.gbest
 
-    def updateGbest(self, population):
+    def ask(self):
         """
-        This function finds the global best position any particle from the population has achieved.
+        Function to move the swarm one iteration forward and get the positions to be evaluated, for callers that
+        evaluate the objective themselves, e.g. on a batch queue. The parameters, velocities and positions are updated
+        (steps 1 and 2 of optimize()), and the fitness of the new positions must then be given to tell() before the
+        next call to ask(). The objective of the swarm is not used.
+
+        If the swarm was created without an objective, the first call returns the initial population, without
+        moving it.
+
+        :return: read-only (population_size, dimension) view of the new positions, one row per particle
+        """
+        if self.asked is not None:
+            raise Exception(self.iteration, "is the iteration whose positions were asked, tell() their fitness first")
+        if self.evaluated:
+            self.updateParameters()
+            self.updateVelocity()
+            self.updatePosition()
+        self.asked = self.positions.view()
+        self.asked.flags.writeable = False
+        return self.asked
+
+    def tell(self, positions, fitness, violations=None):
+        """
+        Function to give the swarm the fitness of the positions returned by ask(). It updates the pbests and the gbest,
+        completes the iteration and checks the stopping criteria (steps 3 and 4 of optimize()).
+
+        With constraints, their violations are computed here unless they are given; callers that want to skip the
+        objective for positions violating cheap constraints can use score() in place of their objective.
+
+        :param positions: the positions returned by ask(), or an (population_size, dimension) array of replacements for
+                          them (e.g. the positions as the evaluation pipeline actually used them), in the same order
+        :param fitness: n fitness values, in the order of positions
+        :param violations: optional n total constraint violations, in the order of positions
+        :return: True, if a stopping criterion is met, else False
+        """
+        if self.asked is None:
+            raise Exception(positions, "were not asked, call ask() before tell()")
+        if positions is not self.asked:
+            positions = asarray(positions)
+            if positions.shape != self.positions.shape:
+                raise Exception(positions.shape, "is not a valid shape, the positions must be (population_size, "
+                                                 "dimension), as returned by ask()")
+            copyto(self.positions, positions)
+        fitness = asarray(fitness, dtype=float).reshape(self.fitnesses.shape)
+        if self.constraints is not None:
+            if violations is None:
+                violations = self.constraints.violation(self.positions)
+            violations = asarray(violations, dtype=float).reshape(self.population_size)
+        self.asked = None
+        self.evaluations += self.population_size
+        self.updatePbest(fitness, violations)
+        if not self.evaluated:  # initial population, every pbest was just set
+            self.evaluated = True
+            return False
+        if self.constraints is not None and self.constraints.adapt(self.gbestViolation == 0):
+            self.updateGbest()  # the penalty changed, so may the order of the pbests
+        self.iteration += 1
+        if self.refinement is not None:
+            self.refinement.update(self)
+        self.recordGbest()
+        self.topology.update(self)
+        if not self.stoppingStarted:
+            self.startStopping()
+        return self.checknstop()
+
+    def optimizeAsync(self):
+        """
+        This function will start an asynchronous (steady-state) optimization process of PSO.
+
+        Instead of waiting for the whole swarm to be evaluated before moving on, every particle has its own evaluation
+        in flight. As soon as an evaluation completes, the pbest of that particle and the gbest are updated, and the
+        particle immediately gets a new velocity, position and evaluation using the gbest known at that moment. Workers
+        therefore never sit idle waiting for the slowest evaluation of an iteration.
+
+        The evaluations run on the worker pool of the swarm if it was created with workers, else on a single
+        background thread; positions found in the cache of the swarm are not sent to them. The run is given the same
+        budget as optimize(), population_size evaluations for every iteration left, and the convergence check is done
+        every population_size evaluations. No checkpoints are saved in this mode.
+
+        :return: gbest - the solution of the optimization process
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait  # imported here as it is slow to import
+
+        if self.constraints is not None or self.screening is not None or self.refinement is not None:
+            raise Exception(self.constraints or self.screening or self.refinement,
+                            "is not supported in the asynchronous mode, use optimize()")
+        evaluator = self.evaluator
+        if evaluator is None:
+            evaluator = ParallelEvaluator(self.cache.objective if self.cache is not None else self.objective, workers=1,
+                                          backend="thread")
+
+        if not self.evaluated:
+            positions = self.ask()
+            self.tell(positions, *self.score(positions))
+        self.updateGbest()
+
+        start, startEvaluations = time.perf_counter(), self.evaluations
+        self.startStopping()
+        self.startReporting()
+        budget = (self.maxiterations - self.iteration) * self.population_size
+        pending = {}  # future -> (particle, position being evaluated)
+        ready = []  # (particle, fitness) of the new positions that were found in the cache
+
+        def dispatch(j):
+            self.moveParticle(j)
+            position = self.positions[j:j + 1].copy()
+            if self.cache is not None:
+                fitness, missing = self.cache.lookup(position)
+                if not missing[0]:
+                    ready.append((j, fitness[0]))
+                    return
+            pending[evaluator.submit(position)] = (j, position)
+
+        self.updateParameters()
+        for j in range(self.population_size):
+            dispatch(j)
+        submitted = self.population_size
+        stopped = False
+
+        try:
+            while pending or ready:
+                completed, ready = ready, []
+                if not completed:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        j, position = pending.pop(future)
+                        currentFitness = float(asarray(future.result(), dtype=float).reshape(1)[0])
+                        if self.cache is not None:
+                            self.cache.store(position, [currentFitness])
+                        completed.append((j, currentFitness))
+
+                for j, currentFitness in completed:
+                    self.evaluations += 1
+                    self.fitnesses[j] = currentFitness
+                    if self.isBetter(currentFitness, self.pbestFitness[j]):
+                        self.pbests[j] = self.positions[j]
+                        self.pbestFitness[j] = currentFitness
+                        if self.isBetter(currentFitness, self.gbestFitness):
+                            self.setGbest(j)
+
+                    if (self.evaluations - startEvaluations) % self.population_size == 0:
+                        self.iteration += 1
+                        self.recordGbest()
+                        self.topology.update(self)
+                        self.updateParameters()
+                        stopped = stopped or self.checknstop()
+                        if self.reporters:
+                            self.report(self.iteration, start)
+                    if not stopped and submitted < budget:
+                        dispatch(j)
+                        submitted += 1
+        finally:
+            for future in pending:
+                future.cancel()
+            if evaluator is not self.evaluator:
+                evaluator.close()
+
+        self.elapsed += time.perf_counter() - start
+        self.updateThroughput(start, startEvaluations)
+        self.finishReporting(self.iteration, start)
+        return self.gbest
+
+    def moveParticle(self, j):
+        """
+        Function to update the velocity and the position of a single particle, used by the asynchronous mode. It
+        applies the same expressions and bounds handling as updateVelocity and updatePosition, to row j only.
+
+        :param j: index of the particle
+        """
+        r1, r2 = self.rng.random(2)
+        social = self.gbest
+        if self.neighbors is not None:
+            neighbors = self.neighbors[j]
+            best = argmin if self.mode == "min" else argmax
+            social = self.pbests[neighbors[best(self.pbestFitness[neighbors])]]
+        self.velocities[j] = self.w * self.velocities[j] + (self.c1 * r1 * (self.pbests[j] - self.positions[j])) + (
+                    self.c2 * r2 * (social - self.positions[j]))
+        if self.vmax is not None:
+            clip(self.velocities[j], self.vmin, self.vmax, out=self.velocities[j])
+        self.positions[j] += self.velocities[j]
+        self.repairBounds(self.positions[j:j + 1], self.velocities[j:j + 1], self.lower, self.upper, self.rng)
+
+    def updateThroughput(self, start, startEvaluations):
+        """
+        Function to record the throughput of the run that started at the given time and evaluation count.
+
+        :param start: time.perf_counter() value at the start of the run
+        :param startEvaluations: value of self.evaluations at the start of the run
+        """
+        elapsed = time.perf_counter() - start
+        self.evaluationsPerSecond = (self.evaluations - startEvaluations) / elapsed if elapsed > 0 else 0.0
+
+    def updateVelocity(self):
+        """
+        Function to update the velocity of every particle according to the following expression:
+
+        Velocity(T+1) = w * Velocity(T) + c1 * random_num1 * (pbest - position) + c2 * random_num2 * (gbest - position)
+
+        random_num1 and random_num2 are drawn once per particle, as a (population_size, 1) column each. With a
+        neighbourhood topology, gbest is replaced by the lbest of each particle. With vmax, the velocities are then
+        clamped to [-vmax, vmax] along each variable.
+
+        The expression is evaluated in place, term by term, in the velocities and a preallocated work array.
+        """
+        r1, r2 = self.nextCoefficients()
+        social = self.socialBests()
+        velocities, scratch, column = self.velocities, self.scratch, self.column
+        velocities *= self.w
+        subtract(self.pbests, self.positions, out=scratch)
+        scratch *= multiply(self.c1, r1, out=column)
+        velocities += scratch
+        subtract(social, self.positions, out=scratch)
+        scratch *= multiply(self.c2, r2, out=column)
+        velocities += scratch
+        if self.vmax is not None:
+            clip(self.velocities, self.vmin, self.vmax, out=self.velocities)
+
+    def updateParameters(self):
+        """
+        Function to resolve the schedules of w, c1 and c2 into the values used by the coming iteration. Constant
+        parameters are left as they are.
+        """
+        for name, schedule in self.schedules.items():
+            setattr(self, name, schedule(self))
+
+    def socialBests(self):
+        """
+        Function to get the position every particle is attracted to by the social term of the velocity update.
+
+        :return: gbest, or the (population_size, dimension) array of the lbests with a neighbourhood topology
+        """
+        return self.gbest if self.neighbors is None else self.localBests()
+
+    def localBests(self):
+        """
+        Function to find the best pbest of the neighbourhood of every particle, with one gather of the pbest fitnesses
+        over the neighbourhood array and a reduction along its rows. Every step writes to work arrays allocated on the
+        first call.
+
+        :return: (population_size, dimension) array, the lbest of each particle
+        """
+        rows, k = self.neighbors.shape
+        if self.lbests is None or self.neighborFitness.shape != (rows, k):
+            self.lbests = empty_like(self.pbests)
+            self.neighborFitness = empty((rows, k))
+            self.neighborColumn = empty(rows, dtype=intp)
+            self.neighborIndex = empty(rows, dtype=intp)
+            self.neighborOffsets = arange(rows, dtype=intp) * k  # index of the first neighbour of each row
+        fitness, best = self.pbestFitness, argmin if self.mode == "min" else argmax
+        if self.constraints is not None:
+            fitness, best = self.constraints.ranks(self.pbestFitness, self.pbestViolations, self.mode), argmin
+        take(fitness, self.neighbors, out=self.neighborFitness, mode="clip")
+        best(self.neighborFitness, axis=1, out=self.neighborColumn)
+        self.neighborColumn += self.neighborOffsets
+        take(self.neighbors, self.neighborColumn, out=self.neighborIndex, mode="clip")
+        return take(self.pbests, self.neighborIndex, axis=0, out=self.lbests, mode="clip")
+
+    def nextCoefficients(self):
+        """
+        Function to get the random coefficients of the velocity update for the next iteration.
+
+        The coefficients are drawn in bulk, for coefficientBlock iterations with one call to the generator, and handed
+        out one iteration at a time.
+
+        :return: r1, r2 - (population_size, 1) arrays of uniform random numbers in [0, 1)
+        """
+        if self.coefficients is None:
+            self.coefficients = self.rng.random((self.coefficientBlock, 2, self.population_size, 1), dtype=self.dtype)
+            self.coefficientIndex = 0
+        elif self.coefficientIndex == len(self.coefficients):
+            self.rng.random(out=self.coefficients, dtype=self.coefficients.dtype)  # refill the block in place
+            self.coefficientIndex = 0
+        r1, r2 = self.coefficients[self.coefficientIndex]
+        self.coefficientIndex += 1
+        return r1, r2
+
+    def spawn(self, count):
+        """
+        Function to derive independent random number generators from the generator of the swarm, e.g. to seed the
+        swarms of parallel restarts.
+
+        :param count: number of generators
+        :return: list of count numpy.random.Generator
+        """
+        return spawnGenerators(self.rng, count)
+
+    def updatePosition(self):
+        """
+        Function to update the position of every particle according to the following expression:
+
+        Position(T+1) = Position(T) + Velocity(T+1)
+
+        Coordinates that leave the bounds are then repaired by the boundary strategy of the swarm.
+
+        NOTE: the position update has to be made only after the velocity is updated.
+        """
+        self.positions += self.velocities
+        self.repairBounds(self.positions, self.velocities, self.lower, self.upper, self.rng, self.scratch,
+                          self.outside)
+
+    def updatePbest(self, currentFitness, currentViolations=None):
+        """
+        This function takes the fitness of every particle at its current position, and replaces the pbest of the
+        particles whose current position is better than their previous pbest.
+
+        gbest is kept incrementally: only the best of the new positions is compared with the current gbest, since no
+        other pbest can have overtaken it. The pbests are replaced in place, through a preallocated mask.
+
+        :param currentFitness: float array of the fitness of the current position of every particle
+        :param currentViolations: float array of the constraint violation of the current position of every particle,
+                                  required with constraints
+        """
+        copyto(self.fitnesses, currentFitness)
+        if self.constraints is None:
+            improved = self.isBetter(currentFitness, self.pbestFitness, out=self.improved)
+        else:
+            copyto(self.violations, currentViolations)
+            improved = self.improved
+            copyto(improved, self.isBetter(currentFitness, self.pbestFitness, violation=currentViolations,
+                                           otherViolation=self.pbestViolations))
+            copyto(self.pbestViolations, currentViolations, where=improved)
+        if improved.any():
+            copyto(self.pbests, self.positions, where=improved[:, None])
+            copyto(self.pbestFitness, currentFitness, where=improved)
+            j = self.bestOf(currentFitness, currentViolations)
+            if currentViolations is None:
+                better = self.isBetter(currentFitness[j], self.gbestFitness)
+            else:
+                better = self.isBetter(currentFitness[j], self.gbestFitness, violation=currentViolations[j],
+                                       otherViolation=self.gbestViolation)
+            if better:
+                self.setGbest(j)
+
+    def updateGbest(self):
+        """
+        This function finds the global best position any particle from the population has achieved, by scanning all
+        the pbests. It is only needed when the pbests are set from outside the normal update, e.g. at initialization.
 
-        :param population: population (swarm) containing particles
-        :param mode: mode indicates whether the problem is to be minimized or maximized
         :return: gbest
         """
-        self.bestParticle = population[0]
+        self.setGbest(self.bestOf(self.pbestFitness, self.pbestViolations))
+        return self.gbest
+
+    def setGbest(self, j):
+        """
+        Function to make the pbest of particle j the gbest.
+
+        :param j: index of the particle
+        """
+        self.bestIndex = j
+        self.gbest = self.pbests[j].copy()
+        self.gbestFitness = self.pbestFitness[j]
+        self.gbestViolation = self.pbestViolations[j] if self.pbestViolations is not None else 0.0
+
+    def bestOf(self, fitness, violations=None):
+        """
+        Function to find the best of an array of fitness values according to the mode of the problem.
+
+        :param fitness: array of fitness values
+        :param violations: optional array of the constraint violations that go with them, see Constraints.best
+        :return: index of the best value
+        """
+        if violations is not None:
+            return self.constraints.best(fitness, violations, self.bestOf, self.mode)
+        if self.mode == "min":
+            return argmin(fitness)
+        return argmax(fitness)
+
+    def emigrants(self, count):
+        """
+        Function to select the particles that migrate to other swarms, in the island model: copies of the count best
+        pbests, best first.
+
+        :param count: number of migrants
+        :return: (count, dimension) array of positions and the array of their count fitness values
+        """
+        order = self.pbestOrder()[:count]
+        return self.pbests[order].copy(), self.pbestFitness[order].copy()
+
+    def immigrate(self, positions, fitness):
+        """
+        Function to receive migrants from other swarms, in the island model. The particles with the worst pbests are
+        moved to the migrants, which become their pbests, and gbest is updated. Their velocities are kept.
+
+        :param positions: (n, dimension) array of positions of the migrants
+        :param fitness: array of the n fitness values of the migrants
+        """
+        worst = self.pbestOrder()[::-1][:len(positions)]
+        self.positions[worst] = positions[:len(worst)]
+        self.pbests[worst] = positions[:len(worst)]
+        self.fitnesses[worst] = fitness[:len(worst)]
+        self.pbestFitness[worst] = fitness[:len(worst)]
+        if self.constraints is not None:
+            self.violations[worst] = self.pbestViolations[worst] = self.constraints.violation(positions[:len(worst)])
+        self.updateGbest()
+
+    def pbestOrder(self):
+        """
+        Function to sort the pbests according to the mode of the problem, and to the constraints if there are some.
 
-        for i in range(1, len(population)):
-            if population[i].pbestFitness > self.bestParticle.pbestFitness:
-                self.bestParticle = population[i]
+        :return: indices of the particles, best pbest first
+        """
+        if self.constraints is not None:
+            return self.constraints.order(self.pbestFitness, self.pbestViolations, self.mode)
+        order = argsort(self.pbestFitness)
+        return order if self.mode == "min" else order[::-1]
+
+    def recordGbest(self):
+        """
+        Function to append the fitness of gbest to the convergence history allGbests. With a historyLimit, the oldest
+        values are dropped in chunks of historyLimit, which keeps the cost per iteration constant.
+        """
+        self.allGbests.append(self.gbestFitness)
+        if self.historyLimit is not None and len(self.allGbests) >= 2 * self.historyLimit:
+            del self.allGbests[:self.historyLimit]
+
+    def isBetter(self, fitness, other, out=None, violation=None, otherViolation=None):
+        """
+        Function to compare fitness values according to the mode of the problem, works elementwise on arrays.
+
+        :param fitness: fitness value(s) to be tested
+        :param other: fitness value(s) to compare against
+        :param out: optional boolean array the result is written to, for arrays
+        :param violation: optional constraint violation(s) of fitness, to compare them according to the constraints
+                          of the swarm, see Constraints.better
+        :param otherViolation: constraint violation(s) of other, with violation
+        :return: True where fitness is strictly better than other
+        """
+        if violation is not None:
+            return self.constraints.better(fitness, violation, other, otherViolation, self.isBetter, self.mode)
+        if out is not None:
+            return (less if self.mode == "min" else greater)(fitness, other, out=out)
+        if self.mode == "min":
+            return fitness < other
+        return fitness > other
+
+    def startStopping(self):
+        """
+        Function to reset the stopping criteria at the beginning of an optimization run.
+        """
+        self.stopReason = None
+        self.stoppingStarted = True
+        for criterion in self.stopping:
+            criterion.start(self)
 
-        self.gbest = self.bestParticle.pbest
+    def startReporting(self):
+        """
+        Function to tell the reporters that an optimization run begins.
+        """
+        for reporter in self.reporters:
+            reporter.start(self)
+
+    def report(self, iteration, start):
+        """
+        Function to pass the statistics of the swarm to the reporters that are due after the given iteration.
+
+        :param iteration: number of iterations completed so far in the run
+        :param start: time.perf_counter() value at the start of the run
+        """
+        statistics = None
+        for reporter in self.reporters:
+            if iteration % reporter.every == 0:
+                if statistics is None:
+                    statistics = IterationStatistics(self, iteration, time.perf_counter() - start)
+                reporter.report(statistics)
+
+    def finishReporting(self, iteration, start):
+        """
+        Function to tell the reporters that an optimization run has ended.
+
+        :param iteration: number of iterations completed in the run
+        :param start: time.perf_counter() value at the start of the run
+        """
+        if self.reporters:
+            statistics = IterationStatistics(self, iteration, time.perf_counter() - start)
+            for reporter in self.reporters:
+                reporter.finish(statistics)
 
     def checknstop(self):
         """
-        This function will check if convergence or max iterations has reached, and stop the optimization process. It is
-        assumed that the convergence is reached if the value of gbests is not changing over a few iterations.
+        This function will check if any of the stopping criteria is met, and stop the optimization process. Every
+        criterion is updated on every call, in constant time, so that their state stays current.
 
-        :param iteration_number: indicates the current iteration number of the process
         :return: True, if convergence is reached, else False
         """
-        if len(self.allGbests) > 50:
-            self.allGbests.pop(0)
-        return self.allGbests[1:] == self.allGbests[:-1]
\ No newline at end of file
+        stop = False
+        for criterion in self.stopping:
+            if criterion.update(self) and not stop:
+                stop = True
+                self.stopReason = criterion.reason
+        return stop
+
+    def evaluate(self, positions):
+        """
+        Function to evaluate the objective on a batch of positions. The evaluations are counted by the caller, i.e.
+        tell() and the initialization of the population.
+
+        :param positions: (n, dimension) array of positions whose fitness is to be evaluated
+        :return: float array of n fitness values
+        """
+        return asarray(self.objective(positions), dtype=float).reshape(len(positions))
+
+    def score(self, positions, screen=True):
+        """
+        Function to evaluate a batch of positions with the constraints and the surrogate screening of the swarm: the
+        positions the screening doesn't select (see Screening.select) and those that violate cheap constraints (see
+        Constraints.score) are not evaluated with the objective, and get the worst possible fitness. They are counted in
+        screenedEvaluations and skippedEvaluations, and still count in evaluations, as positions scored. The surrogate
+        model is then trained on the positions evaluated.
+
+        :param positions: (n, dimension) array of positions whose fitness is to be evaluated
+        :param screen: if False, the screening selects every position, e.g. for the initial population, which has no
+                       pbests to compare with
+        :return: fitness, violations - float arrays of n values, violations is None without constraints
+        """
+        if self.constraints is None and self.screening is None:
+            return self.evaluate(positions), None
+        selected = self.screening.select(positions, self) if self.screening is not None and screen else None
+        if self.constraints is not None:
+            fitness, violations, evaluated = self.constraints.score(positions, self.evaluate, self.mode, selected)
+        else:
+            violations, evaluated = None, selected
+            if selected is None:
+                fitness = self.evaluate(positions)
+            else:
+                fitness = full(len(positions), inf if self.mode == "min" else -inf)
+                fitness[selected] = self.evaluate(positions[selected])
+        chosen = len(positions) if selected is None else int(selected.sum())
+        self.screenedEvaluations += len(positions) - chosen
+        self.skippedEvaluations += chosen - (len(positions) if evaluated is None else int(evaluated.sum()))
+        if self.screening is not None:
+            if evaluated is None:
+                self.screening.update(positions, fitness)
+            else:
+                self.screening.update(positions[evaluated], fitness[evaluated])
+        return fitness, violations
+
+    def saveCheckpoint(self, path):
+        """
+        Function to save the complete state of the swarm to a file: the parameters and topology, positions,
+        velocities, pbests and fitnesses of the particles, gbest, the state of the random number generator, the
+        iteration and evaluation counters and the convergence history. A swarm loaded from it continues bit-identically
+        to this one.
+
+        The state is a handful of arrays dumped in bulk, and the file is replaced atomically, see writeCheckpoint. The
+        objective, the worker pool, the cache, the stopping criteria and the reporters are not saved; they are given
+        again when loading, as is a topology that is not one of TOPOLOGIES. With ask() and tell(), the checkpoint is
+        taken between a tell() and the next ask().
+
+        :param path: path of the checkpoint file
+        """
+        if self.asked is not None:
+            raise Exception(path, "can't be written while positions asked by ask() wait for tell()")
+        coefficients = self.coefficients
+        if coefficients is None:
+            coefficients = zeros((0, 2, self.population_size, 1))
+        refinement = self.refinement
+        surrogate = self.screening.model.state() if self.screening is not None else (zeros((0, 0)), zeros(0), 0)
+        writeCheckpoint(path, {
+            "population_size": self.population_size, "dimension": self.dimension,
+            "maxiterations": self.maxiterations, "lower": self.lower, "upper": self.upper,
+            "w": self.w, "c1": self.c1, "c2": self.c2, "mode": self.mode, "boundary": self.boundary,
+            "positions": self.positions, "velocities": self.velocities, "pbests": self.pbests,
+            "pbestFitness": self.pbestFitness, "fitnesses": self.fitnesses, "bestIndex": self.bestIndex,
+            "gbest": self.gbest, "gbestFitness": self.gbestFitness, "rng": generatorState(self.rng),
+            "coefficients": coefficients, "coefficientIndex": self.coefficientIndex,
+            "coefficientBlock": self.coefficientBlock, "iteration": self.iteration, "evaluations": self.evaluations,
+            "allGbests": asarray(self.allGbests, dtype=float),
+            "neighbors": self.neighbors if self.neighbors is not None else zeros((0, 0), dtype=int),
+            "topology": topologyState(self.topology),
+            "vmax": self.vmax if self.vmax is not None else zeros(0), "evaluated": self.evaluated,
+            "pbestViolations": self.pbestViolations if self.constraints is not None else zeros(0),
+            "violations": self.violations if self.constraints is not None else zeros(0),
+            "gbestViolation": self.gbestViolation, "skippedEvaluations": self.skippedEvaluations,
+            "penalty": self.constraints.penalty if self.constraints is not None else 0.0,
+            "penaltyStreak": self.constraints.streak if self.constraints is not None else 0,
+            "elapsed": self.elapsed, "screenedEvaluations": self.screenedEvaluations,
+            "surrogatePositions": surrogate[0], "surrogateFitness": surrogate[1], "surrogateNext": surrogate[2],
+            "refinement": [refinement.used, refinement.improvements, refinement.last] if refinement is not None else
+            zeros(0, dtype=int),
+        })
+
+    @classmethod
+    def load(cls, path, objective=None, **options):
+        """
+        Function to recreate a swarm from a checkpoint file written by saveCheckpoint, without evaluating anything.
+
+        :param path: path of the checkpoint file
+        :param objective: batched fitness function of the swarm, as given to the constructor
+        :param options: other keyword parameters of the constructor (workers, cache, stopping, reporters, ...), and
+                        maxiterations to give the run a new budget; by default the loaded swarm keeps checkpointing
+                        to path. Schedules of w, c1 and c2 are saved as their current values, pass them again to
+                        keep following them. The topology is restored if it is one of TOPOLOGIES, pass any other
+                        topology again
+        :return: the restored Swarm
+        """
+        import inspect  # imported here as it is slow to import
+
+        state = readCheckpoint(path)
+        # the defaults of the constructor, overridden by the parameters saved in the checkpoint, then by options
+        signature = inspect.signature(Swarm.__init__)
+        parameters = {name: parameter.default for name, parameter in signature.parameters.items()
+                      if parameter.default is not inspect.Parameter.empty}
+        parameters.update({"population_size": int(state["population_size"]), "dimension": int(state["dimension"]),
+                           "maxiterations": int(state["maxiterations"]), "bounds": [state["lower"], state["upper"]],
+                           "w": float(state["w"]), "c1": float(state["c1"]), "c2": float(state["c2"]),
+                           "mode": str(state["mode"]), "objective": objective, "boundary": str(state["boundary"]),
+                           "checkpoint": path, "vmax": state["vmax"] if state["vmax"].size else None,
+                           "dtype": str(state["positions"].dtype), "topology": restoreTopology(str(state["topology"]))})
+        parameters.update(options)
+
+        swarm = cls.__new__(cls)
+        swarm.configure(**parameters)
+        for name in ("positions", "velocities", "pbests", "pbestFitness", "fitnesses", "gbest"):
+            setattr(swarm, name, state[name])
+        swarm.w, swarm.c1, swarm.c2 = float(state["w"]), float(state["c1"]), float(state["c2"])
+        swarm.bestIndex = int(state["bestIndex"])
+        swarm.gbestFitness = float(state["gbestFitness"])
+        swarm.rng = restoreGenerator(str(state["rng"]))
+        swarm.coefficients = state["coefficients"] if len(state["coefficients"]) else None
+        swarm.coefficientIndex = int(state["coefficientIndex"])
+        swarm.coefficientBlock = int(state["coefficientBlock"])
+        swarm.iteration = int(state["iteration"])
+        swarm.evaluations = int(state["evaluations"])
+        swarm.elapsed = float(state["elapsed"])
+        swarm.evaluated = bool(state["evaluated"])
+        swarm.allGbests = state["allGbests"].tolist()
+        swarm.neighbors = state["neighbors"] if state["neighbors"].size else None
+        swarm.pbestViolations = swarm.violations = None
+        swarm.gbestViolation = float(state["gbestViolation"])
+        swarm.skippedEvaluations = int(state["skippedEvaluations"])
+        if swarm.constraints is not None:
+            if state["pbestViolations"].size:
+                swarm.pbestViolations, swarm.violations = state["pbestViolations"], state["violations"]
+                swarm.constraints.penalty = float(state["penalty"])
+                swarm.constraints.streak = int(state["penaltyStreak"])
+            else:  # saved without constraints
+                swarm.pbestViolations = swarm.constraints.violation(swarm.pbests)
+                swarm.violations = swarm.constraints.violation(swarm.positions)
+                swarm.updateGbest()
+        swarm.screenedEvaluations = int(state["screenedEvaluations"])
+        if swarm.screening is not None:
+            swarm.screening.model.restore(state["surrogatePositions"], state["surrogateFitness"],
+                                          int(state["surrogateNext"]))
+        if swarm.refinement is not None and state["refinement"].size:
+            swarm.refinement.used, swarm.refinement.improvements, swarm.refinement.last = state["refinement"].tolist()
+        return swarm
+
+    @classmethod
+    def resume(cls, path, objective=None, **options):
+        """
+        Function to continue the optimization run saved in a checkpoint file, see load.
+
+        :param path: path of the checkpoint file
+        :param objective: batched fitness function of the swarm, as given to the constructor
+        :param options: other keyword parameters of the constructor
+        :return: gbest - the solution of the optimization process
+        """
+        with cls.load(path, objective, **options) as swarm:
+            return swarm.optimize()
+
+    def stateBytes(self):
+        """
+        Function to measure the memory held by the arrays of the swarm: the state of the particles, the work arrays of
+        the updates and the block of random coefficients.
+
+        :return: number of bytes
+        """
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, ndarray))
+
+    def close(self):
+        """
+        Function to release the worker pool of a parallel objective, if there is one.
+        """
+        if self.evaluator is not None:
+            self.evaluator.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def plotConvergenceGraph(self):
+        """
+        Function to plot the change in fitness of best particle over iterations, see plotting.plotConvergenceGraph.
+        :return:
+        """
+        from plotting import plotConvergenceGraph  # imported here so that matplotlib is only loaded for plotting
+        plotConvergenceGraph(self.allGbests)
+
+    def fitness(self, positions):
+        """
+        Function to check the fitness of a batch of positions. The fitness of a particle is the indication of how near
+        the position of the particle is to that of the solution.
+
+        This is the objective used when none is passed to the constructor.
+
+        :param positions: (n, dimension) array of positions (solutions) whose fitness is to be evaluated
+        :return: array of n fitness values
+        """
+
+        # TODO: Implement your fitness function here
+
+        fitness = zeros(len(positions))
+
+        return fitness
@@ -4,15 +4,40 @@
 # domain search: -inf < xi < inf
 
 # Problem formulation for three variables, i.e. dimension = 3
-# Each particle will have three variables, let's take swarm population size = 10, maxiterations = 10000,
-# bounds = [-1000, 1000], w = 1, c1 = 2, c2 = 2, and mode = "min"
+# Each particle will have three variables, let's take swarm population size = 100, maxiterations = 3000,
+# bounds = [-10, 10], w, c1 and c2 from Clerc's constriction coefficient, and mode = "min"
+# (with w = 1, c1 = 2, c2 = 2 the velocities grow without bound and the swarm never settles)
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
 
 from swarm import *
 
-rosenbrock_swarm = Swarm(100, 3, 300000, [-10, 10], 1, 2, 2, "min")
+
+def rosenbrock(positions):
+    """
+    Rosenbrock function for n = 3, evaluated for a whole batch of positions with one array expression.
+
+    :param positions: (n, 3) array of positions
+    :return: array of n fitness values
+    """
+    # extract x1, x2, x3 as columns
+    x1 = positions[:, 0]
+    x2 = positions[:, 1]
+    x3 = positions[:, 2]
+    # Now calculate the fitness
+    return (100 * ((x2 - x1) * (x2 - x1)) + ((1 - x1) * (1 - x1))) + (
+            100 * ((x3 - x2) * (x3 - x2)) + ((1 - x2) * (1 - x2)))
+
+
+w, c1, c2 = constriction(2.05, 2.05)
+rosenbrock_swarm = Swarm(100, 3, 3000, [-10, 10], w, c1, c2, "min", objective=rosenbrock,
+                         reporters=[LogReporter(every=500)])
 
 optimal_sol = rosenbrock_swarm.optimize()
 
 print(optimal_sol)
 
-rosenbrock_swarm.plotConvergenceGraph()
\ No newline at end of file
+rosenbrock_swarm.plotConvergenceGraph()
@@ -1,7 +1,21 @@
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
 from swarm import *
 
-a = Swarm(10, 1, 1000, [-1, 1], 1, 2, 2, "max")
+
+def sine(position):
+    """
+    Fitness of a single position: sin(x1)
+    """
+    return math.sin(position[0])
+
+
+a = Swarm(10, 1, 1000, [-1, 1], 1, 2, 2, "max", objective=ScalarObjective(sine), reporters=[LogReporter(every=100)])
 
 max = a.optimize()
 
-print(max)
\ No newline at end of file
+print(max)
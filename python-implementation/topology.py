@@ -0,0 +1,151 @@
+import json
+
+from numpy import arange, column_stack, concatenate, int64
+
+
+class Topology:
+    """
+    This class is the base of the neighbourhood topologies of the swarm.
+
+    With a topology, each particle is attracted by the best pbest of its neighbourhood (lbest) instead of the gbest of
+    the whole swarm, which slows the spread of information and keeps the swarm from converging prematurely on
+    multimodal problems. A topology is an integer array of shape (population_size, k): row i lists the k particles of
+    the neighbourhood of particle i, itself included. The array is built once, so the lbests of the whole swarm come
+    from a single gather of the pbest fitnesses, a reduction along the rows and a gather of the pbests.
+
+    """
+
+    def neighbors(self, population_size, rng):
+        """
+        Function to build the neighbourhoods of the swarm.
+
+        :param population_size: number of particles
+        :param rng: numpy.random.Generator of the swarm, for random topologies
+        :return: (population_size, k) integer array of particle indices, or None for the whole swarm (gbest)
+        """
+        raise NotImplementedError
+
+    def update(self, swarm):
+        """
+        Function called by the swarm after every iteration, for topologies that change during a run. It may replace
+        swarm.neighbors.
+
+        :param swarm: swarm being optimized
+        """
+        pass
+
+
+class Star(Topology):
+    """
+    Every particle is connected to every other one, i.e. the classic gbest swarm. This is the default, and is handled
+    by the swarm without any neighbourhood array.
+
+    """
+
+    def neighbors(self, population_size, rng):
+        return None
+
+
+class Ring(Topology):
+    """
+    The particles are placed on a ring, and each one is connected to the radius particles on either side of it.
+
+    """
+
+    def __init__(self, radius=1):
+        """
+        :param radius: number of neighbours on each side
+        """
+        self.radius = radius
+
+    def neighbors(self, population_size, rng):
+        offsets = arange(-self.radius, self.radius + 1)
+        return (arange(population_size)[:, None] + offsets) % population_size
+
+
+class VonNeumann(Topology):
+    """
+    The particles are placed on a rows x columns grid that wraps around at the edges (a torus), and each one is
+    connected to the particles above, below, left and right of it.
+
+    """
+
+    def __init__(self, rows=None):
+        """
+        :param rows: number of rows of the grid, it must divide the population size; by default the grid is made as
+                     square as possible
+        """
+        self.rows = rows
+
+    def neighbors(self, population_size, rng):
+        rows = self.rows
+        if rows is None:
+            rows = max(divisor for divisor in range(1, int(population_size ** 0.5) + 1)
+                       if population_size % divisor == 0)
+        if population_size % rows:
+            raise Exception(rows, "is not a valid parameter, the number of rows must divide the population size")
+        columns = population_size // rows
+        index = arange(population_size)
+        row, column = index // columns, index % columns
+        return column_stack((index,
+                             ((row - 1) % rows) * columns + column, ((row + 1) % rows) * columns + column,
+                             row * columns + (column - 1) % columns, row * columns + (column + 1) % columns))
+
+
+class RandomDynamic(Topology):
+    """
+    Each particle is connected to k particles drawn at random, and the connections are drawn again every few
+    iterations, in one call to the random number generator.
+
+    """
+
+    def __init__(self, k=3, every=10):
+        """
+        :param k: number of random neighbours of each particle (besides itself)
+        :param every: number of iterations between two rewirings
+        """
+        self.k = k
+        self.every = every
+
+    def neighbors(self, population_size, rng):
+        return concatenate((arange(population_size, dtype=int64)[:, None],
+                            rng.integers(0, population_size, size=(population_size, self.k))), axis=1)
+
+    def update(self, swarm):
+        if swarm.iteration % self.every == 0:
+            swarm.neighbors = self.neighbors(swarm.population_size, swarm.rng)
+
+
+# topologies selectable by name in the swarm, with their default parameters
+TOPOLOGIES = {
+    "star": Star,
+    "ring": Ring,
+    "vonneumann": VonNeumann,
+    "random": RandomDynamic,
+}
+
+
+def topologyState(topology):
+    """
+    Function to capture a topology as a string, e.g. to save it in a checkpoint.
+
+    :param topology: Topology of the swarm
+    :return: JSON string of its name in TOPOLOGIES and its parameters, or "" if it is not one of TOPOLOGIES
+    """
+    for name, kind in TOPOLOGIES.items():
+        if type(topology) is kind:
+            return json.dumps({"name": name, "parameters": vars(topology)})
+    return ""
+
+
+def restoreTopology(state):
+    """
+    Function to recreate a topology from a string captured by topologyState.
+
+    :param state: string returned by topologyState
+    :return: Topology, or None if the state is ""
+    """
+    if not state:
+        return None
+    state = json.loads(state)
+    return TOPOLOGIES[state["name"]](**state["parameters"])